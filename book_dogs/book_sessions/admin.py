@@ -1,3 +1,127 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
 
-# Register your models here.
+from shared.admin.options import ServiceDeleteMixin
+from shared.admin.paginators import EstimatedCountPaginator
+from .models import BookSession, ReadingSession
+from .services import BookSessionService, ReadingSessionService
+
+
+def _reading_sessions_subquery(aggregate):
+    return Subquery(
+        ReadingSession.objects.filter(book_session=OuterRef("pk"))
+        .order_by()
+        .values("book_session")
+        .annotate(value=aggregate)
+        .values("value"),
+        output_field=IntegerField(),
+    )
+
+
+@admin.register(BookSession)
+class BookSessionAdmin(ServiceDeleteMixin, admin.ModelAdmin):
+    list_display = (
+        "id",
+        "title",
+        "author",
+        "owner",
+        "page_number",
+        "is_finished",
+        "sessions_count",
+        "pages_read",
+        "created_at",
+    )
+    list_select_related = ("owner", "archive_summary")
+    list_filter = ("is_finished",)
+    raw_id_fields = ("owner",)
+    search_fields = ("=owner__email",)
+    readonly_fields = ("created_at", "updated_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["refresh_finished_status"]
+
+    def get_queryset(self, request):
+        # Per-row subqueries rather than a join + GROUP BY over every session
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                _sessions_count=_reading_sessions_subquery(Count("pk")),
+                _pages_read=_reading_sessions_subquery(Sum("pages_read")),
+            )
+        )
+
+    @admin.display(description="Sessions")
+    def sessions_count(self, obj):
+        archive_summary = BookSessionService._get_archive_summary(obj)
+        archived = archive_summary.sessions_count if archive_summary else 0
+        return (obj._sessions_count or 0) + archived
+
+    @admin.display(description="Pages read")
+    def pages_read(self, obj):
+        archive_summary = BookSessionService._get_archive_summary(obj)
+        archived = archive_summary.pages_read if archive_summary else 0
+        return (obj._pages_read or 0) + archived
+
+    def delete_model(self, request, obj):
+        BookSessionService.delete_book_sessions(BookSession.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        BookSessionService.delete_book_sessions(queryset)
+
+    @admin.action(description="Mark selected books finished if fully read")
+    def refresh_finished_status(self, request, queryset):
+        updated = BookSessionService.refresh_finished_status(queryset.values("pk"))
+        self.message_user(request, f"Marked {updated} books finished.")
+
+
+class ActiveSessionFilter(admin.SimpleListFilter):
+    """Served by the partial index on active sessions. There's no "ended"
+    choice, nothing indexes those."""
+
+    title = "status"
+    parameter_name = "status"
+
+    def lookups(self, request, model_admin):
+        return [("active", "Active")]
+
+    def queryset(self, request, queryset):
+        if self.value() == "active":
+            return queryset.filter(end_time__isnull=True)
+        return queryset
+
+
+@admin.register(ReadingSession)
+class ReadingSessionAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "book_session",
+        "owner",
+        "start_time",
+        "end_time",
+        "pages_read",
+    )
+    list_select_related = ("book_session", "book_session__owner")
+    list_filter = (ActiveSessionFilter,)
+    raw_id_fields = ("book_session",)
+    readonly_fields = ("start_time", "created_at", "updated_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["close_stale_sessions"]
+
+    @admin.display(description="Owner")
+    def owner(self, obj):
+        return obj.book_session.owner
+
+    def delete_model(self, request, obj):
+        ReadingSessionService.delete_session(obj)
+
+    def delete_queryset(self, request, queryset):
+        ReadingSessionService.delete_sessions(queryset)
+
+    @admin.action(description="Close selected sessions that went stale")
+    def close_stale_sessions(self, request, queryset):
+        closed = ReadingSessionService.close_stale_sessions(sessions=queryset)
+        self.message_user(
+            request, f"Closed {closed} stale sessions.", level=messages.SUCCESS
+        )
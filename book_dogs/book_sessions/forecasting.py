@@ -0,0 +1,151 @@
+import math
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import BookSession, ReadingSession
+
+# Pages read this many days ago weigh half as much as pages read today
+PACE_HALF_LIFE_DAYS = 14
+# Shortest history a pace is averaged over, so one long session today
+# doesn't project the whole book for tomorrow
+MIN_PACE_WINDOW_DAYS = 1.0
+# Anything further out isn't a forecast worth showing
+MAX_FORECAST_DAYS = 10 * 365
+
+
+def estimate_pace(book_index, ages, pages, books_count, half_life=PACE_HALF_LIFE_DAYS):
+    """Recency-weighted pages per day for many books at once.
+
+    ``book_index``, ``ages`` (days since each session ended) and ``pages`` are
+    parallel arrays with one entry per session. Each session's pages are
+    weighted by exp(-decay * age) and divided by the weighted length of the
+    book's reading history, i.e. the integral of the same weight from its
+    oldest session until now.
+    """
+    import numpy as np
+
+    decay = math.log(2) / half_life
+    weighted_pages = np.bincount(
+        book_index, weights=pages * np.exp(-decay * ages), minlength=books_count
+    )
+
+    window = np.zeros(books_count)
+    np.maximum.at(window, book_index, ages)
+    window = np.maximum(window, MIN_PACE_WINDOW_DAYS)
+    weighted_days = -np.expm1(-decay * window) / decay
+
+    return weighted_pages / weighted_days
+
+
+def project_finish_days(pace, remaining_pages):
+    """Days until finished at ``pace``; NaN where there's no pace to go on"""
+    import numpy as np
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days = np.maximum(remaining_pages, 0) / pace
+    days[(pace <= 0) | (days > MAX_FORECAST_DAYS)] = np.nan
+    return days
+
+
+def _cache():
+    # One copy for all workers, so invalidating after a write served by one
+    # of them reaches the others
+    return caches[settings.SHARED_CACHE]
+
+
+class ReadingForecastService:
+    CACHE_TIMEOUT = 60 * 60
+
+    @staticmethod
+    def cache_key(user_id):
+        return f"book-forecast:{user_id}"
+
+    @staticmethod
+    def invalidate_on_commit(user_ids):
+        """Drop the users' cached forecasts once the transaction commits"""
+        keys = [ReadingForecastService.cache_key(user_id) for user_id in user_ids]
+        transaction.on_commit(partial(_cache().delete_many, keys))
+
+    @staticmethod
+    def get_forecasts(user):
+        """Projected finish dates for all of a user's unfinished books.
+
+        Cached until the user's books or sessions change (or CACHE_TIMEOUT).
+        """
+        key = ReadingForecastService.cache_key(user.pk)
+        forecasts = _cache().get(key)
+        if forecasts is None:
+            forecasts = ReadingForecastService._compute(user)
+            _cache().set(key, forecasts, ReadingForecastService.CACHE_TIMEOUT)
+        return forecasts
+
+    @staticmethod
+    def _compute(user):
+        # numpy is imported on first use, not at worker boot (~40 ms)
+        import numpy as np
+
+        books = list(
+            BookSession.objects.filter(owner=user, is_finished=False)
+            .annotate(archived_pages_read=Coalesce(F("archive_summary__pages_read"), 0))
+            .order_by("pk")
+            .values_list("pk", "title", "page_number", "archived_pages_read")
+        )
+        if not books:
+            return []
+
+        # Whole history in one query, turned straight into arrays
+        sessions = list(
+            ReadingSession.objects.filter(
+                book_session__owner=user,
+                book_session__is_finished=False,
+                pages_read__gt=0,
+            ).values_list("book_session_id", "end_time", "pages_read")
+        )
+        book_ids, end_times, pages = zip(*sessions) if sessions else ((), (), ())
+
+        # Books are ordered by pk, so a binary search finds each one's index
+        book_pks = np.array([book[0] for book in books], dtype=np.int64)
+        book_index = np.searchsorted(book_pks, np.asarray(book_ids, dtype=np.int64))
+        now = timezone.now().timestamp()
+        ages = (
+            now
+            - np.fromiter(
+                # Pages logged on a still active session count as read now
+                (end_time.timestamp() if end_time else now for end_time in end_times),
+                dtype=float,
+                count=len(end_times),
+            )
+        ) / 86400
+        pages = np.asarray(pages, dtype=float)
+
+        pace = estimate_pace(book_index, ages, pages, len(books))
+        # Without any sessions bincount comes back as ints, hence the astype
+        pages_read = np.bincount(
+            book_index, weights=pages, minlength=len(books)
+        ).astype(float)
+        pages_read += np.array([book[3] for book in books], dtype=float)
+        remaining = np.array([book[2] for book in books], dtype=float) - pages_read
+        days = project_finish_days(pace, remaining)
+
+        today = timezone.localdate()
+        return [
+            {
+                "book_session": pk,
+                "title": title,
+                "remaining_pages": max(int(remaining[i]), 0),
+                "pages_per_day": round(float(pace[i]), 2),
+                "projected_finish": (
+                    None
+                    if np.isnan(days[i])
+                    else today + timedelta(days=math.ceil(days[i]))
+                ),
+            }
+            for i, (pk, title, _, _) in enumerate(books)
+        ]
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from book_sessions.services import ReadingSessionArchiveService
+
+
+class Command(BaseCommand):
+    help = (
+        "Move old reading sessions of finished books into the archive tables. "
+        "Totals stay correct through the per-book archive summary."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            help="Archive sessions that ended longer ago than this "
+            "(default: READING_SESSION_ARCHIVE_AFTER)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        older_than = settings.READING_SESSION_ARCHIVE_AFTER
+        if options["older_than_days"] is not None:
+            older_than = timedelta(days=options["older_than_days"])
+
+        if older_than <= timedelta(0):
+            raise CommandError("--older-than-days must be positive")
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size must be positive")
+
+        archived = ReadingSessionArchiveService.archive_sessions(
+            older_than=older_than, chunk_size=options["chunk_size"]
+        )
+        self.stdout.write(f"Archived {archived} reading sessions")
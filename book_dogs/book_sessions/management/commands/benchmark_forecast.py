@@ -0,0 +1,102 @@
+import statistics
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from book_sessions.forecasting import (
+    ReadingForecastService,
+    estimate_pace,
+    project_finish_days,
+)
+from book_sessions.models import BookSession, ReadingSession
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the finish-date forecast end to end (queries, row conversion and "
+        "the vectorized kernel) on a synthetic reading history. The data is "
+        "written inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=1000)
+        parser.add_argument("--sessions", type=int, default=100, help="Per book")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        books, per_book = options["books"], options["sessions"]
+        rng = np.random.default_rng(options["seed"])
+
+        with transaction.atomic():
+            user = self.seed(rng, books, per_book)
+            end_to_end = self.time(
+                options["repeat"], lambda: ReadingForecastService._compute(user)
+            )
+            transaction.set_rollback(True)
+
+        book_index = np.repeat(np.arange(books), per_book)
+        ages = rng.uniform(0, 365, size=books * per_book)
+        pages = rng.integers(1, 60, size=books * per_book).astype(float)
+        remaining = rng.integers(0, 800, size=books).astype(float)
+        kernel = self.time(
+            options["repeat"],
+            lambda: project_finish_days(
+                estimate_pace(book_index, ages, pages, books), remaining
+            ),
+        )
+
+        self.stdout.write(f"{books} books x {per_book} sessions:")
+        self.report("end to end", end_to_end, options["repeat"])
+        self.report("numpy kernel only", kernel, options["repeat"])
+
+    def seed(self, rng, books, per_book):
+        user = User.objects.create_user(
+            username="forecast-benchmark", email="forecast-benchmark@example.com"
+        )
+        book_sessions = BookSession.objects.bulk_create(
+            BookSession(
+                owner=user,
+                title=f"Book {i}",
+                description="",
+                page_number=int(page_number),
+                author="",
+                genre="",
+            )
+            for i, page_number in enumerate(rng.integers(200, 1200, size=books))
+        )
+
+        now = timezone.now()
+        ages = rng.uniform(0, 365, size=(books, per_book))
+        pages = rng.integers(1, 10, size=(books, per_book))
+        for book_session, book_ages, book_pages in zip(book_sessions, ages, pages):
+            ReadingSession.objects.bulk_create(
+                ReadingSession(
+                    book_session=book_session,
+                    start_time=now - timedelta(days=age, hours=1),
+                    end_time=now - timedelta(days=age),
+                    pages_read=int(pages_read),
+                )
+                for age, pages_read in zip(book_ages, book_pages)
+            )
+        return user
+
+    def time(self, repeat, fn):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def report(self, label, timings, repeat):
+        self.stdout.write(
+            f"  {label:<18} best {min(timings) * 1000:.2f} ms, "
+            f"median {statistics.median(timings) * 1000:.2f} ms "
+            f"over {repeat} runs"
+        )
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from book_sessions.services import ReadingSessionService
+
+
+class Command(BaseCommand):
+    help = (
+        "Close reading sessions that were started and never ended. Nothing "
+        "in the app schedules it: run it from cron, e.g. every 15 minutes "
+        "with `*/15 * * * * python manage.py close_stale_sessions`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--idle-minutes",
+            type=int,
+            help="Idle time before a session counts as stale "
+            "(default: STALE_SESSION_IDLE_THRESHOLD)",
+        )
+        parser.add_argument(
+            "--max-duration-minutes",
+            type=int,
+            help="Reading time credited to a closed session "
+            "(default: STALE_SESSION_MAX_DURATION)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        idle_for = settings.STALE_SESSION_IDLE_THRESHOLD
+        if options["idle_minutes"] is not None:
+            idle_for = timedelta(minutes=options["idle_minutes"])
+
+        max_duration = settings.STALE_SESSION_MAX_DURATION
+        if options["max_duration_minutes"] is not None:
+            max_duration = timedelta(minutes=options["max_duration_minutes"])
+
+        if idle_for <= timedelta(0) or max_duration <= timedelta(0):
+            raise CommandError("Durations must be positive")
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size must be positive")
+
+        closed = ReadingSessionService.close_stale_sessions(
+            idle_for=idle_for,
+            max_duration=max_duration,
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(f"Closed {closed} stale reading sessions")
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book_sessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='readingsession',
+            index=models.Index(condition=models.Q(('end_time__isnull', True)), fields=['updated_at'], name='readingsession_active_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:05
+
+import datetime
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book_sessions', '0002_readingsession_active_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedReadingSession',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('pages_read', models.PositiveIntegerField(default=0)),
+                ('book_session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_sessions', to='book_sessions.booksession')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReadingSessionArchiveSummary',
+            fields=[
+                ('book_session', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive_summary', serialize=False, to='book_sessions.booksession')),
+                ('sessions_count', models.PositiveIntegerField(default=0)),
+                ('pages_read', models.PositiveIntegerField(default=0)),
+                ('reading_time', models.DurationField(default=datetime.timedelta(0))),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedSessionNote',
+            fields=[
+                ('session', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='note', serialize=False, to='book_sessions.archivedreadingsession')),
+                ('notes', models.TextField()),
+            ],
+        ),
+    ]
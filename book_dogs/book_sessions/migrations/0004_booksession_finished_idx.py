@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('book_sessions', '0003_reading_session_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booksession',
+            index=models.Index(fields=['is_finished', '-id'], name='booksession_finished_idx'),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from datetime import timedelta
 from django.db import models
 from users.models import User
 
@@ -18,6 +19,17 @@ class BookSession(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Admin is_finished filter, in changelist (-pk) order
+            models.Index(
+                fields=["is_finished", "-id"], name="booksession_finished_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
 
 class ReadingSession(models.Model):
     book_session = models.ForeignKey(
@@ -30,3 +42,57 @@ class ReadingSession(models.Model):
     is_finished = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Active sessions only, for the stale session sweeper
+            models.Index(
+                fields=["updated_at"],
+                condition=models.Q(end_time__isnull=True),
+                name="readingsession_active_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Session {self.pk} of book {self.book_session_id}"
+
+
+class ArchivedReadingSession(models.Model):
+    """Compact copy of an old session of a finished book.
+
+    Keeps the original id. Notes live in ArchivedSessionNote so the hot
+    columns stay narrow.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    book_session = models.ForeignKey(
+        BookSession, on_delete=models.CASCADE, related_name="archived_sessions"
+    )
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    pages_read = models.PositiveIntegerField(default=0)
+
+
+class ArchivedSessionNote(models.Model):
+    session = models.OneToOneField(
+        ArchivedReadingSession,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="note",
+    )
+    notes = models.TextField()
+
+
+class ReadingSessionArchiveSummary(models.Model):
+    """Totals of a book's archived sessions, added to the live ones"""
+
+    book_session = models.OneToOneField(
+        BookSession,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="archive_summary",
+    )
+    sessions_count = models.PositiveIntegerField(default=0)
+    pages_read = models.PositiveIntegerField(default=0)
+    reading_time = models.DurationField(default=timedelta(0))
+    updated_at = models.DateTimeField(auto_now=True)
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import BookSession, ReadingSession
+from .models import ArchivedReadingSession, BookSession, ReadingSession
 from .services import BookSessionService, ReadingSessionService
 
 
@@ -59,3 +59,35 @@ class ReadingSessionSerializer(serializers.ModelSerializer):
         """Get duration as seconds using service layer"""
         duration = ReadingSessionService.calculate_duration(obj)
         return int(duration.total_seconds())
+
+
+class ArchivedReadingSessionSerializer(serializers.ModelSerializer):
+    duration = serializers.SerializerMethodField()
+    notes = serializers.SerializerMethodField()
+    archived = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedReadingSession
+        fields = [
+            "id",
+            "book_session",
+            "pages_read",
+            "start_time",
+            "end_time",
+            "duration",
+            "notes",
+            "archived",
+        ]
+
+    def get_duration(self, obj):
+        """Get duration as seconds using service layer"""
+        duration = ReadingSessionService.calculate_duration(obj)
+        return int(duration.total_seconds())
+
+    def get_notes(self, obj):
+        """Notes are stored apart from the archived row"""
+        note = getattr(obj, "note", None)
+        return note.notes if note else ""
+
+    def get_archived(self, obj):
+        return True
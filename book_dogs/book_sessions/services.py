@@ -1,9 +1,21 @@
 from datetime import timedelta
-from django.db.models import Sum
+from django.conf import settings
+from django.db.models import F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
 from django.db import transaction
 from django.core.exceptions import ValidationError
 from django.utils import timezone
-from .models import BookSession, ReadingSession
+from shared.db.bulk import delete_where_in
+from shared.db.routing import replica_read
+from .models import (
+    ArchivedReadingSession,
+    ArchivedSessionNote,
+    BookSession,
+    ReadingSession,
+    ReadingSessionArchiveSummary,
+)
+from .forecasting import ReadingForecastService
+from .tasks import process_ended_session
 
 
 class BookSessionService:
@@ -15,6 +27,7 @@ class BookSessionService:
                 raise ValidationError("Page number must be positive")
 
             book_session = BookSession.objects.create(owner=owner, **data)
+            ReadingForecastService.invalidate_on_commit([owner.pk])
             return book_session
 
     @staticmethod
@@ -38,21 +51,84 @@ class BookSessionService:
                 book_session.is_finished = True
 
             book_session.save()
+            ReadingForecastService.invalidate_on_commit([book_session.owner_id])
             return book_session
 
     @staticmethod
     def delete_book_session(book_session):
+        BookSessionService.delete_book_sessions(
+            BookSession.objects.filter(pk=book_session.pk)
+        )
+
+    @staticmethod
+    def delete_book_sessions(book_sessions):
+        """Delete a queryset of book sessions with set-based queries.
+
+        The reading history goes first with one DELETE per table instead of
+        the ORM loading every session to cascade; active sessions go with it,
+        there is nothing to close on a book that's being deleted.
+        """
+        book_session_ids = book_sessions.values("pk")
         with transaction.atomic():
-            # Business logic: stop any active reading sessions
-            active_sessions = book_session.reading_sessions.filter(
-                end_time__isnull=True
+            ReadingForecastService.invalidate_on_commit(
+                set(book_sessions.values_list("owner_id", flat=True))
+            )
+            archived_session_ids = ArchivedReadingSession.objects.filter(
+                book_session__in=book_session_ids
+            ).values("pk")
+            delete_where_in(ArchivedSessionNote, "session", archived_session_ids)
+            delete_where_in(ArchivedReadingSession, "book_session", book_session_ids)
+            delete_where_in(ReadingSession, "book_session", book_session_ids)
+
+            return book_sessions.delete()
+
+    @staticmethod
+    def _total_pages_read():
+        """Pages read of the book in each row, archived sessions included"""
+        live_pages_read = (
+            ReadingSession.objects.filter(book_session=OuterRef("pk"))
+            .order_by()
+            .values("book_session")
+            .annotate(total=Sum("pages_read"))
+            .values("total")
+        )
+        return Coalesce(Subquery(live_pages_read), 0) + Coalesce(
+            F("archive_summary__pages_read"), 0
+        )
+
+    @staticmethod
+    def refresh_finished_status(book_session_ids):
+        """Mark books finished once their pages read reach the page count"""
+        updated = (
+            BookSession.objects.filter(
+                pk__in=book_session_ids, is_finished=False, page_number__gt=0
+            )
+            .alias(total_pages_read=BookSessionService._total_pages_read())
+            .filter(total_pages_read__gte=F("page_number"))
+            .update(is_finished=True, updated_at=timezone.now())
+        )
+        if updated:
+            # Finished books drop out of their owners' forecasts
+            ReadingForecastService.invalidate_on_commit(
+                BookSession.objects.filter(pk__in=book_session_ids)
+                .values_list("owner_id", flat=True)
+                .distinct()
             )
-            for session in active_sessions:
-                ReadingSessionService.end_session(session)
+        return updated
 
-            book_session.delete()
+    @staticmethod
+    def refresh_unfinished_status(book_session_ids):
+        """Mark finished books unfinished once their pages read fall short,
+        e.g. after some of their sessions were deleted"""
+        return (
+            BookSession.objects.filter(pk__in=book_session_ids, is_finished=True)
+            .alias(total_pages_read=BookSessionService._total_pages_read())
+            .filter(Q(page_number__lte=0) | Q(total_pages_read__lt=F("page_number")))
+            .update(is_finished=False, updated_at=timezone.now())
+        )
 
     @staticmethod
+    @replica_read
     def calculate_progress(book_session):
         if book_session.page_number <= 0:
             return 0
@@ -67,16 +143,21 @@ class BookSessionService:
         total_duration = timedelta(0)
         for session in sessions:
             total_duration += ReadingSessionService.calculate_duration(session)
+
+        archive_summary = BookSessionService._get_archive_summary(book_session)
+        if archive_summary:
+            total_duration += archive_summary.reading_time
         return total_duration
 
     @staticmethod
+    @replica_read
     def get_reading_statistics(book_session):
         return {
             "progress": BookSessionService.calculate_progress(book_session),
             "total_reading_time": BookSessionService.get_total_reading_time(
                 book_session
             ),
-            "sessions_count": book_session.reading_sessions.count(),
+            "sessions_count": BookSessionService._get_sessions_count(book_session),
             "average_session_length": BookSessionService._get_average_session_length(
                 book_session
             ),
@@ -85,33 +166,150 @@ class BookSessionService:
             ),
         }
 
+    @staticmethod
+    def _get_archive_summary(book_session):
+        """Totals of archived sessions, None if nothing was archived"""
+        try:
+            return book_session.archive_summary
+        except ReadingSessionArchiveSummary.DoesNotExist:
+            return None
+
     @staticmethod
     def _get_total_pages_read(book_session):
-        return (
+        total_pages_read = (
             book_session.reading_sessions.aggregate(total=Sum("pages_read"))["total"]
             or 0
         )
+        archive_summary = BookSessionService._get_archive_summary(book_session)
+        if archive_summary:
+            total_pages_read += archive_summary.pages_read
+        return total_pages_read
 
     @staticmethod
-    def _get_average_session_length(book_session):
-        sessions = book_session.reading_sessions.filter(end_time__isnull=False)
-        if not sessions.exists():
-            return timedelta(0)
+    def _get_sessions_count(book_session, ended_only=False):
+        sessions = book_session.reading_sessions.all()
+        if ended_only:
+            sessions = sessions.filter(end_time__isnull=False)
+
+        sessions_count = sessions.count()
+        # Only ended sessions get archived
+        archive_summary = BookSessionService._get_archive_summary(book_session)
+        if archive_summary:
+            sessions_count += archive_summary.sessions_count
+        return sessions_count
 
-        total_time = sum(
-            [ReadingSessionService.calculate_duration(session) for session in sessions],
-            timedelta(0),
+    @staticmethod
+    def _get_average_session_length(book_session):
+        sessions_count = BookSessionService._get_sessions_count(
+            book_session, ended_only=True
         )
+        if not sessions_count:
+            return timedelta(0)
 
-        return total_time / sessions.count()
+        total_time = BookSessionService.get_total_reading_time(book_session)
+        return total_time / sessions_count
 
     @staticmethod
     def _get_average_pages_per_session(book_session):
         total_pages = BookSessionService._get_total_pages_read(book_session)
-        session_count = book_session.reading_sessions.count()
+        session_count = BookSessionService._get_sessions_count(book_session)
         return total_pages / session_count if session_count > 0 else 0
 
 
+class ReadingSessionArchiveService:
+    @staticmethod
+    def archive_sessions(older_than=None, chunk_size=1000):
+        """Move old sessions of finished books to the archive tables.
+
+        Each chunk is read, copied, folded into the book's archive summary and
+        deleted from ReadingSession in one short transaction. Its rows are
+        locked while that happens, so a session deleted or edited in the
+        meantime isn't archived from a stale copy.
+        """
+        older_than = older_than or settings.READING_SESSION_ARCHIVE_AFTER
+        archivable_sessions = ReadingSession.objects.filter(
+            book_session__is_finished=True,
+            end_time__isnull=False,
+            end_time__lt=timezone.now() - older_than,
+        )
+
+        archived = 0
+        last_pk = 0
+        while True:
+            with transaction.atomic():
+                chunk = list(
+                    archivable_sessions.filter(pk__gt=last_pk)
+                    .order_by("pk")
+                    # Not the books: their own updates shouldn't wait on this
+                    .select_for_update(of=("self",))
+                    .values_list(
+                        "pk",
+                        "book_session_id",
+                        "start_time",
+                        "end_time",
+                        "pages_read",
+                        "notes",
+                    )[:chunk_size]
+                )
+                if not chunk:
+                    return archived
+
+                last_pk = chunk[-1][0]
+                ReadingSessionArchiveService._archive_chunk(chunk)
+            archived += len(chunk)
+
+    @staticmethod
+    def _archive_chunk(chunk):
+        ArchivedReadingSession.objects.bulk_create(
+            ArchivedReadingSession(
+                id=pk,
+                book_session_id=book_session_id,
+                start_time=start_time,
+                end_time=end_time,
+                pages_read=pages_read,
+            )
+            for pk, book_session_id, start_time, end_time, pages_read, _ in chunk
+        )
+        ArchivedSessionNote.objects.bulk_create(
+            ArchivedSessionNote(session_id=pk, notes=notes)
+            for pk, *_, notes in chunk
+            if notes
+        )
+
+        totals = {}
+        for _, book_session_id, start_time, end_time, pages_read, _ in chunk:
+            count, pages, reading_time = totals.get(
+                book_session_id, (0, 0, timedelta(0))
+            )
+            totals[book_session_id] = (
+                count + 1,
+                pages + pages_read,
+                reading_time + (end_time - start_time),
+            )
+
+        for book_session_id, (count, pages, reading_time) in totals.items():
+            summary, _ = ReadingSessionArchiveSummary.objects.get_or_create(
+                book_session_id=book_session_id
+            )
+            ReadingSessionArchiveSummary.objects.filter(pk=summary.pk).update(
+                sessions_count=F("sessions_count") + count,
+                pages_read=F("pages_read") + pages,
+                reading_time=F("reading_time") + reading_time,
+                updated_at=timezone.now(),
+            )
+
+        # Nothing references reading sessions, so this is a single DELETE
+        ReadingSession.objects.filter(pk__in=[row[0] for row in chunk]).delete()
+
+    @staticmethod
+    def get_history(book_session):
+        """Live and archived sessions of a book, newest first"""
+        sessions = list(book_session.reading_sessions.all()) + list(
+            book_session.archived_sessions.select_related("note")
+        )
+        return sorted(sessions, key=lambda session: session.start_time, reverse=True)
+
+
 class ReadingSessionService:
     @staticmethod
     def start_session(book_session, **data):
@@ -159,6 +357,16 @@ class ReadingSessionService:
                 reading_session.book_session.is_finished = True
                 reading_session.book_session.save()
 
+            ReadingForecastService.invalidate_on_commit(
+                [reading_session.book_session.owner_id]
+            )
+
+            # Everything else (rollups, notifications...) runs after commit
+            process_ended_session.delay(
+                reading_session.pk,
+                idempotency_key=f"session-ended:{reading_session.pk}",
+            )
+
             return reading_session
 
     @staticmethod
@@ -172,6 +380,9 @@ class ReadingSessionService:
                 setattr(reading_session, field, value)
 
             reading_session.save()
+            ReadingForecastService.invalidate_on_commit(
+                [reading_session.book_session.owner_id]
+            )
             return reading_session
 
     @staticmethod
@@ -188,6 +399,88 @@ class ReadingSessionService:
                 book_session.is_finished = False
                 book_session.save()
 
+            ReadingForecastService.invalidate_on_commit([book_session.owner_id])
+
+    @staticmethod
+    def delete_sessions(reading_sessions):
+        """delete_session for a queryset, e.g. an admin selection.
+
+        Finished status is recomputed and forecasts dropped once per affected
+        book or owner, not once per session.
+        """
+        with transaction.atomic():
+            affected = set(
+                reading_sessions.order_by()
+                .values_list("book_session_id", "book_session__owner_id")
+                .distinct()
+            )
+            deleted, _ = reading_sessions.delete()
+
+            BookSessionService.refresh_unfinished_status(
+                {book_session_id for book_session_id, _ in affected}
+            )
+            ReadingForecastService.invalidate_on_commit(
+                {owner_id for _, owner_id in affected}
+            )
+            return deleted
+
+    @staticmethod
+    def close_stale_sessions(
+        idle_for=None, max_duration=None, chunk_size=1000, sessions=None
+    ):
+        """Close sessions left open with no activity for ``idle_for``.
+
+        ``sessions`` narrows the candidates, e.g. to an admin selection.
+
+        Works through the backlog in pk order, one short transaction and one
+        UPDATE per chunk so no lock is held for long. A closed session gets
+        ``max_duration`` of reading time, never ending in the future nor
+        before its last activity. No per-session side effects run; the
+        leaderboard rebuild picks them up.
+        """
+        idle_for = idle_for or settings.STALE_SESSION_IDLE_THRESHOLD
+        max_duration = max_duration or settings.STALE_SESSION_MAX_DURATION
+        now = timezone.now()
+
+        if sessions is None:
+            sessions = ReadingSession.objects.all()
+        stale_sessions = sessions.filter(
+            end_time__isnull=True, updated_at__lt=now - idle_for
+        )
+
+        closed = 0
+        last_pk = 0
+        while True:
+            chunk = list(
+                stale_sessions.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", "book_session_id", "book_session__owner_id")[
+                    :chunk_size
+                ]
+            )
+            if not chunk:
+                return closed
+
+            last_pk = chunk[-1][0]
+            with transaction.atomic():
+                closed += ReadingSession.objects.filter(
+                    pk__in=[pk for pk, _, _ in chunk], end_time__isnull=True
+                ).update(
+                    # updated_at is the last activity, before this update
+                    end_time=Greatest(
+                        Least(F("start_time") + max_duration, Value(now)),
+                        F("updated_at"),
+                    ),
+                    updated_at=now,
+                )
+                # Once per affected book or owner, not once per session
+                BookSessionService.refresh_finished_status(
+                    {book_session_id for _, book_session_id, _ in chunk}
+                )
+                ReadingForecastService.invalidate_on_commit(
+                    {owner_id for _, _, owner_id in chunk}
+                )
+
     @staticmethod
     def calculate_duration(reading_session):
         if reading_session.end_time and reading_session.start_time:
@@ -195,6 +488,7 @@ class ReadingSessionService:
         return timedelta(0)
 
     @staticmethod
+    @replica_read
     def get_session_stats(reading_session):
         duration = ReadingSessionService.calculate_duration(reading_session)
         pages_per_minute = 0
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent from a background task after a reading session has been ended and the
+# transaction committed. Receivers get ``reading_session`` and may be retried,
+# so they must be idempotent.
+reading_session_ended = Signal()
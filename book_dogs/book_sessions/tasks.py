@@ -0,0 +1,18 @@
+from shared.tasks.queue import task
+from .models import ReadingSession
+from .signals import reading_session_ended
+
+
+@task(max_retries=3)
+def process_ended_session(reading_session_id):
+    """Run post-session side effects off the request path"""
+    reading_session = (
+        ReadingSession.objects.select_related("book_session")
+        .filter(pk=reading_session_id)
+        .first()
+    )
+    if reading_session is None:
+        # Deleted before the task got to it
+        return
+
+    reading_session_ended.send(sender=ReadingSession, reading_session=reading_session)
@@ -1,3 +1,688 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User
+from .forecasting import ReadingForecastService
+from .models import (
+    ArchivedReadingSession,
+    ArchivedSessionNote,
+    BookSession,
+    ReadingSession,
+    ReadingSessionArchiveSummary,
+)
+from .services import (
+    BookSessionService,
+    ReadingSessionArchiveService,
+    ReadingSessionService,
+)
+from .signals import reading_session_ended
+from .tasks import process_ended_session
+
+IMMEDIATE_TASKS = {"BACKEND": "shared.tasks.backends.ImmediateTaskBackend"}
+
+
+def create_book(owner, **data):
+    data = {
+        "title": "Dune",
+        "description": "d",
+        "page_number": 100,
+        "author": "Frank Herbert",
+        "genre": "sci-fi",
+        **data,
+    }
+    return BookSession.objects.create(owner=owner, **data)
+
+
+@override_settings(TASKS=IMMEDIATE_TASKS)
+class EndSessionTaskTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@example.com"
+        )
+        self.book = create_book(self.user)
+        self.ended = []
+
+        def handler(sender, reading_session, **kwargs):
+            self.ended.append(reading_session.pk)
+
+        reading_session_ended.connect(handler)
+        self.addCleanup(reading_session_ended.disconnect, handler)
+
+    def test_signal_sent_once_after_commit(self):
+        reading_session = ReadingSession.objects.create(book_session=self.book)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ReadingSessionService.end_session(reading_session, pages_read=10)
+            self.assertEqual(self.ended, [])
+        self.assertEqual(self.ended, [reading_session.pk])
+
+        # A duplicate enqueue for the same session is skipped
+        with self.captureOnCommitCallbacks(execute=True):
+            process_ended_session.delay(
+                reading_session.pk,
+                idempotency_key=f"session-ended:{reading_session.pk}",
+            )
+        self.assertEqual(self.ended, [reading_session.pk])
+
+    def test_deleted_session_is_ignored(self):
+        process_ended_session(12345)
+        self.assertEqual(self.ended, [])
+
+
+def create_reading_sessions(book, count, pages_read=5):
+    now = timezone.now()
+    return ReadingSession.objects.bulk_create(
+        ReadingSession(
+            book_session=book,
+            start_time=now - timedelta(hours=1),
+            end_time=now,
+            pages_read=pages_read,
+        )
+        for _ in range(count)
+    )
+
+
+class DeleteBookSessionsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="reader", email="reader@example.com"
+        )
+        self.other_user = User.objects.create_user(
+            username="other", email="other@example.com"
+        )
+        self.other_book = create_book(self.other_user)
+        create_reading_sessions(self.other_book, 2)
+
+    def create_history(self, book, sessions_count):
+        create_reading_sessions(book, sessions_count)
+        ReadingSession.objects.create(book_session=book)  # still active
+        archived = ArchivedReadingSession.objects.create(
+            id=10_000 + book.pk,
+            book_session=book,
+            start_time=timezone.now() - timedelta(days=200, hours=1),
+            end_time=timezone.now() - timedelta(days=200),
+            pages_read=7,
+        )
+        ArchivedSessionNote.objects.create(session=archived, notes="old notes")
+        ReadingSessionArchiveSummary.objects.create(
+            book_session=book, sessions_count=1, pages_read=7
+        )
+
+    def test_deletes_books_and_their_history(self):
+        books = [create_book(self.user), create_book(self.user)]
+        for book in books:
+            self.create_history(book, 3)
+
+        BookSessionService.delete_book_sessions(
+            BookSession.objects.filter(owner=self.user)
+        )
+
+        self.assertFalse(BookSession.objects.filter(owner=self.user).exists())
+        self.assertEqual(
+            list(ReadingSession.objects.values_list("book_session", flat=True)),
+            [self.other_book.pk] * 2,
+        )
+        self.assertFalse(ArchivedReadingSession.objects.exists())
+        self.assertFalse(ArchivedSessionNote.objects.exists())
+        self.assertFalse(ReadingSessionArchiveSummary.objects.exists())
+
+    def test_query_count_does_not_grow_with_history(self):
+        def count_queries(sessions_count):
+            book = create_book(self.user)
+            self.create_history(book, sessions_count)
+            with CaptureQueriesContext(connection) as queries:
+                BookSessionService.delete_book_session(book)
+            return len(queries)
+
+        self.assertEqual(count_queries(1), count_queries(50))
+
+    @override_settings(DATABASE_REPLICA_ALIAS=None)
+    def test_delete_endpoint(self):
+        book = create_book(self.user)
+        self.create_history(book, 3)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.delete(f"/api/book-sessions/{book.pk}/")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(BookSession.objects.filter(pk=book.pk).exists())
+        self.assertFalse(ReadingSession.objects.filter(book_session=book.pk).exists())
+
+
+class CloseStaleSessionsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="reader", email="reader@example.com"
+        )
+        self.book = create_book(self.user, page_number=50)
+        self.now = timezone.now()
+
+    def active_session(self, started_ago, idle_for, pages_read=0, book=None):
+        reading_session = ReadingSession.objects.create(
+            book_session=book or self.book, pages_read=pages_read
+        )
+        ReadingSession.objects.filter(pk=reading_session.pk).update(
+            start_time=self.now - started_ago, updated_at=self.now - idle_for
+        )
+        return reading_session
+
+    def test_closes_only_idle_sessions(self):
+        stale = self.active_session(timedelta(hours=14), timedelta(hours=13))
+        recent = self.active_session(timedelta(hours=1), timedelta(minutes=5))
+
+        closed = ReadingSessionService.close_stale_sessions(
+            idle_for=timedelta(hours=12), max_duration=timedelta(hours=2)
+        )
+
+        self.assertEqual(closed, 1)
+        stale.refresh_from_db()
+        recent.refresh_from_db()
+        self.assertEqual(stale.end_time - stale.start_time, timedelta(hours=2))
+        self.assertIsNone(recent.end_time)
+
+    def test_end_time_never_in_the_future(self):
+        # Stale by activity, but started less than max_duration ago
+        reading_session = self.active_session(
+            timedelta(minutes=30), timedelta(minutes=20)
+        )
+
+        ReadingSessionService.close_stale_sessions(
+            idle_for=timedelta(minutes=10), max_duration=timedelta(hours=2)
+        )
+
+        reading_session.refresh_from_db()
+        self.assertLessEqual(reading_session.end_time, timezone.now())
+        self.assertGreaterEqual(reading_session.end_time, self.now)
+
+    def test_end_time_not_before_last_activity(self):
+        # Pages logged 3h into a session that only gets 2h of credit
+        reading_session = self.active_session(timedelta(hours=16), timedelta(hours=13))
+        last_activity = ReadingSession.objects.get(pk=reading_session.pk).updated_at
+
+        ReadingSessionService.close_stale_sessions(
+            idle_for=timedelta(hours=12), max_duration=timedelta(hours=2)
+        )
+
+        reading_session.refresh_from_db()
+        self.assertEqual(reading_session.end_time, last_activity)
+
+    def test_works_in_chunks(self):
+        for _ in range(5):
+            self.active_session(timedelta(days=2), timedelta(days=1))
+
+        closed = ReadingSessionService.close_stale_sessions(chunk_size=2)
+
+        self.assertEqual(closed, 5)
+        self.assertFalse(ReadingSession.objects.filter(end_time__isnull=True).exists())
+
+    def test_marks_fully_read_books_finished(self):
+        self.active_session(timedelta(days=2), timedelta(days=1), pages_read=50)
+        other_book = create_book(self.user, page_number=500)
+        self.active_session(
+            timedelta(days=2), timedelta(days=1), pages_read=50, book=other_book
+        )
+
+        ReadingSessionService.close_stale_sessions()
+
+        self.book.refresh_from_db()
+        other_book.refresh_from_db()
+        self.assertTrue(self.book.is_finished)
+        self.assertFalse(other_book.is_finished)
+
+    def test_limited_to_given_sessions(self):
+        selected = self.active_session(timedelta(days=2), timedelta(days=1))
+        other = self.active_session(timedelta(days=2), timedelta(days=1))
+
+        closed = ReadingSessionService.close_stale_sessions(
+            sessions=ReadingSession.objects.filter(pk=selected.pk)
+        )
+
+        self.assertEqual(closed, 1)
+        other.refresh_from_db()
+        self.assertIsNone(other.end_time)
+
+    def test_command(self):
+        self.active_session(timedelta(hours=3), timedelta(hours=1))
+        out = StringIO()
+
+        call_command("close_stale_sessions", idle_minutes=30, stdout=out)
+
+        self.assertIn("Closed 1 stale reading sessions", out.getvalue())
+
+
+class ArchiveReadingSessionsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="reader", email="reader@example.com"
+        )
+        self.book = create_book(self.user, page_number=100, is_finished=True)
+        self.now = timezone.now()
+
+    def ended_session(self, days_ago, pages_read=10, notes="", book=None):
+        end_time = self.now - timedelta(days=days_ago)
+        reading_session = ReadingSession.objects.create(
+            book_session=book or self.book, pages_read=pages_read, notes=notes
+        )
+        ReadingSession.objects.filter(pk=reading_session.pk).update(
+            start_time=end_time - timedelta(minutes=30), end_time=end_time
+        )
+        return reading_session
+
+    def archive(self, **kwargs):
+        return ReadingSessionArchiveService.archive_sessions(
+            older_than=timedelta(days=180), **kwargs
+        )
+
+    def test_moves_old_sessions_of_finished_books(self):
+        old = self.ended_session(200, notes="great chapter")
+        recent = self.ended_session(10)
+        unfinished_book = create_book(self.user)
+        unfinished_old = self.ended_session(200, book=unfinished_book)
+
+        self.assertEqual(self.archive(), 1)
+
+        self.assertEqual(
+            set(ReadingSession.objects.values_list("pk", flat=True)),
+            {recent.pk, unfinished_old.pk},
+        )
+        archived = ArchivedReadingSession.objects.get()
+        self.assertEqual(archived.pk, old.pk)
+        self.assertEqual(archived.pages_read, 10)
+        self.assertEqual(archived.note.notes, "great chapter")
+
+    def test_statistics_unchanged(self):
+        for days_ago in (400, 300, 200, 20):
+            self.ended_session(days_ago, pages_read=25)
+        before = BookSessionService.get_reading_statistics(self.book)
+
+        self.archive(chunk_size=2)
+
+        self.book = BookSession.objects.get(pk=self.book.pk)
+        self.assertEqual(BookSessionService.get_reading_statistics(self.book), before)
+        summary = self.book.archive_summary
+        self.assertEqual(summary.sessions_count, 3)
+        self.assertEqual(summary.pages_read, 75)
+        self.assertEqual(summary.reading_time, timedelta(minutes=90))
+
+    def test_later_runs_add_to_the_summary(self):
+        self.ended_session(300)
+        self.archive()
+        self.ended_session(200)
+        self.archive()
+
+        summary = ReadingSessionArchiveSummary.objects.get(book_session=self.book)
+        self.assertEqual(summary.sessions_count, 2)
+        self.assertEqual(summary.pages_read, 20)
+
+    def test_history_merges_live_and_archived(self):
+        oldest = self.ended_session(300)
+        middle = self.ended_session(200)
+        newest = self.ended_session(5)
+        self.archive()
+
+        history = ReadingSessionArchiveService.get_history(self.book)
+
+        self.assertEqual(
+            [session.pk for session in history], [newest.pk, middle.pk, oldest.pk]
+        )
+        self.assertIsInstance(history[1], ArchivedReadingSession)
+
+    @override_settings(DATABASE_REPLICA_ALIAS=None)
+    def test_history_endpoint(self):
+        self.ended_session(300, notes="old")
+        self.ended_session(5)
+        self.archive()
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(f"/api/book-sessions/{self.book.pk}/history/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+
+    def test_command(self):
+        self.ended_session(400)
+        out = StringIO()
+        call_command("archive_reading_sessions", older_than_days=365, stdout=out)
+        self.assertIn("Archived 1 reading sessions", out.getvalue())
+
+
+class ForecastTests(TestCase):
+    def setUp(self):
+        caches[settings.SHARED_CACHE].clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@example.com"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def forecasts(self):
+        return {
+            forecast["title"]: forecast
+            for forecast in ReadingForecastService.get_forecasts(self.user)
+        }
+
+    @override_settings(DATABASE_REPLICA_ALIAS=None)
+    def test_books_without_pages_read(self):
+        # Regression: no session with pages made bincount return ints
+        active_only = create_book(self.user, title="Active only")
+        ReadingSession.objects.create(book_session=active_only)
+        create_book(self.user, title="Untouched")
+
+        response = self.client.get("/api/book-sessions/forecast/")
+
+        self.assertEqual(response.status_code, 200)
+        for forecast in response.data:
+            self.assertEqual(forecast["remaining_pages"], 100)
+            self.assertEqual(forecast["pages_per_day"], 0)
+            self.assertIsNone(forecast["projected_finish"])
+
+    def test_projects_from_recent_pace(self):
+        book = create_book(self.user, page_number=300)
+        create_book(self.user, title="Finished", is_finished=True)
+        now = timezone.now()
+        ReadingSession.objects.bulk_create(
+            ReadingSession(
+                book_session=book,
+                start_time=now - timedelta(days=day, hours=1),
+                end_time=now - timedelta(days=day),
+                pages_read=10,
+            )
+            for day in range(10)
+        )
+        ReadingSessionArchiveSummary.objects.create(
+            book_session=book, sessions_count=5, pages_read=50
+        )
+
+        forecast = self.forecasts()["Dune"]
+
+        self.assertEqual(list(self.forecasts()), ["Dune"])
+        self.assertEqual(forecast["remaining_pages"], 150)
+        self.assertGreater(forecast["pages_per_day"], 5)
+        self.assertGreater(forecast["projected_finish"], timezone.localdate())
+
+    def test_cache_invalidated_by_book_changes(self):
+        book = create_book(self.user)
+        self.assertEqual(list(self.forecasts()), ["Dune"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BookSessionService.create_book_session(
+                self.user,
+                title="Emma",
+                description="d",
+                page_number=50,
+                author="a",
+                genre="g",
+            )
+        self.assertEqual(sorted(self.forecasts()), ["Dune", "Emma"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BookSessionService.update_book_session(book, page_number=400)
+        self.assertEqual(self.forecasts()["Dune"]["remaining_pages"], 400)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BookSessionService.delete_book_session(book)
+        self.assertEqual(list(self.forecasts()), ["Emma"])
+
+    def test_cache_invalidated_by_session_changes(self):
+        book = create_book(self.user)
+        reading_session = ReadingSessionService.start_session(book)
+        self.assertEqual(self.forecasts()["Dune"]["remaining_pages"], 100)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ReadingSessionService.update_session(reading_session, pages_read=30)
+        self.assertEqual(self.forecasts()["Dune"]["remaining_pages"], 70)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ReadingSessionService.delete_session(reading_session)
+        self.assertEqual(self.forecasts()["Dune"]["remaining_pages"], 100)
+
+    def test_cached_for_all_workers(self):
+        create_book(self.user)
+        self.forecasts()
+
+        cached = caches[settings.SHARED_CACHE].get(
+            ReadingForecastService.cache_key(self.user.pk)
+        )
+        self.assertEqual([forecast["title"] for forecast in cached], ["Dune"])
+
+    def test_cache_invalidated_by_finished_status_refresh(self):
+        book = create_book(self.user, page_number=10)
+        create_reading_sessions(book, 2)
+        self.assertEqual(list(self.forecasts()), ["Dune"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BookSessionService.refresh_finished_status([book.pk])
+        self.assertEqual(list(self.forecasts()), [])
+
+    def test_cache_invalidated_by_closing_stale_sessions(self):
+        book = create_book(self.user, page_number=1000)
+        started = timezone.now() - timedelta(days=3)
+        reading_session = ReadingSession.objects.create(
+            book_session=book, pages_read=50
+        )
+        ReadingSession.objects.filter(pk=reading_session.pk).update(
+            start_time=started, updated_at=started
+        )
+        # Pages of an active session count as read today
+        pace_while_active = self.forecasts()["Dune"]["pages_per_day"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ReadingSessionService.close_stale_sessions()
+        self.assertLess(self.forecasts()["Dune"]["pages_per_day"], pace_while_active)
+
+
+@override_settings(DATABASE_REPLICA_ALIAS=None)
+class BookSessionAdminTests(TestCase):
+    changelist_url = "/admin/book_sessions/booksession/"
+
+    def setUp(self):
+        admin_user = User.objects.create_superuser(
+            username="admin", email="admin@example.com"
+        )
+        self.client.force_login(admin_user)
+        self.reader = User.objects.create_user(
+            username="reader", email="reader@example.com"
+        )
+        self.books = [create_book(self.reader), create_book(self.reader, title="Emma")]
+        for book in self.books:
+            create_reading_sessions(book, 3)
+
+    def test_changelists_load(self):
+        for url in (
+            self.changelist_url,
+            f"{self.changelist_url}?is_finished__exact=0",
+            f"{self.changelist_url}?q=reader@example.com",
+            "/admin/book_sessions/readingsession/?status=active",
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_delete_confirmation_lists_only_the_book(self):
+        response = self.client.get(f"{self.changelist_url}{self.books[0].pk}/delete/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["deleted_objects"], ["Book session: Dune"])
+
+    def test_delete_view_uses_the_service(self):
+        with mock.patch.object(
+            BookSessionService,
+            "delete_book_sessions",
+            wraps=BookSessionService.delete_book_sessions,
+        ) as delete_book_sessions:
+            response = self.client.post(
+                f"{self.changelist_url}{self.books[0].pk}/delete/", {"post": "yes"}
+            )
+
+        self.assertEqual(response.status_code, 302)
+        delete_book_sessions.assert_called_once()
+        self.assertFalse(BookSession.objects.filter(pk=self.books[0].pk).exists())
+        self.assertEqual(ReadingSession.objects.count(), 3)
+
+    def test_delete_action_uses_the_service(self):
+        with mock.patch.object(
+            BookSessionService,
+            "delete_book_sessions",
+            wraps=BookSessionService.delete_book_sessions,
+        ) as delete_book_sessions:
+            response = self.client.post(
+                self.changelist_url,
+                {
+                    "action": "delete_selected",
+                    "_selected_action": [book.pk for book in self.books],
+                    "post": "yes",
+                },
+            )
+
+        self.assertEqual(response.status_code, 302)
+        delete_book_sessions.assert_called_once()
+        self.assertFalse(BookSession.objects.exists())
+        self.assertFalse(ReadingSession.objects.exists())
+
+
+class DeleteSessionsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="reader", email="reader@example.com"
+        )
+        self.books = [
+            create_book(self.user, page_number=10, is_finished=True),
+            create_book(self.user, title="Emma", page_number=10, is_finished=True),
+        ]
+        for book in self.books:
+            create_reading_sessions(book, 2)
+
+    def test_unfinishes_books_that_fall_short(self):
+        dune, emma = self.books
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted = ReadingSessionService.delete_sessions(
+                ReadingSession.objects.filter(pk=dune.reading_sessions.first().pk)
+            )
+
+        self.assertEqual(deleted, 1)
+        dune.refresh_from_db()
+        emma.refresh_from_db()
+        self.assertFalse(dune.is_finished)
+        self.assertTrue(emma.is_finished)
+
+    def test_queries_dont_grow_with_sessions(self):
+        with CaptureQueriesContext(connection) as few:
+            ReadingSessionService.delete_sessions(
+                ReadingSession.objects.filter(book_session=self.books[0])
+            )
+        create_reading_sessions(self.books[1], 20)
+        with CaptureQueriesContext(connection) as many:
+            ReadingSessionService.delete_sessions(
+                ReadingSession.objects.filter(book_session=self.books[1])
+            )
+
+        self.assertEqual(len(many), len(few))
+        self.assertFalse(BookSession.objects.filter(is_finished=True).exists())
+
+    def test_invalidates_forecasts(self):
+        caches[settings.SHARED_CACHE].clear()
+        ReadingForecastService.get_forecasts(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ReadingSessionService.delete_sessions(ReadingSession.objects.all())
+
+        self.assertEqual(
+            sorted(
+                forecast["title"]
+                for forecast in ReadingForecastService.get_forecasts(self.user)
+            ),
+            ["Dune", "Emma"],
+        )
+
+
+@override_settings(DATABASE_REPLICA_ALIAS=None)
+class ReadingSessionAdminTests(TestCase):
+    changelist_url = "/admin/book_sessions/readingsession/"
+
+    def setUp(self):
+        admin_user = User.objects.create_superuser(
+            username="admin", email="admin@example.com"
+        )
+        self.client.force_login(admin_user)
+        reader = User.objects.create_user(username="reader", email="reader@example.com")
+        self.book = create_book(reader, page_number=10, is_finished=True)
+        self.reading_sessions = create_reading_sessions(self.book, 2)
+
+    def test_delete_view_uses_the_service(self):
+        with mock.patch.object(
+            ReadingSessionService,
+            "delete_session",
+            wraps=ReadingSessionService.delete_session,
+        ) as delete_session:
+            response = self.client.post(
+                f"{self.changelist_url}{self.reading_sessions[0].pk}/delete/",
+                {"post": "yes"},
+            )
+
+        self.assertEqual(response.status_code, 302)
+        delete_session.assert_called_once()
+        self.book.refresh_from_db()
+        self.assertFalse(self.book.is_finished)
+
+    def test_delete_action_uses_the_service(self):
+        with mock.patch.object(
+            ReadingSessionService,
+            "delete_sessions",
+            wraps=ReadingSessionService.delete_sessions,
+        ) as delete_sessions:
+            response = self.client.post(
+                self.changelist_url,
+                {
+                    "action": "delete_selected",
+                    "_selected_action": [
+                        reading_session.pk for reading_session in self.reading_sessions
+                    ],
+                    "post": "yes",
+                },
+            )
+
+        self.assertEqual(response.status_code, 302)
+        delete_sessions.assert_called_once()
+        self.assertFalse(ReadingSession.objects.exists())
+        self.book.refresh_from_db()
+        self.assertFalse(self.book.is_finished)
+
+
+class ArchiveChunkTransactionTests(TransactionTestCase):
+    def test_chunks_are_read_inside_their_transaction(self):
+        user = User.objects.create_user(username="reader", email="reader@example.com")
+        book = create_book(user, is_finished=True)
+        reading_sessions = create_reading_sessions(book, 3)
+        ReadingSession.objects.update(end_time=timezone.now() - timedelta(days=200))
+
+        # Whether each read of the sessions ran inside a transaction
+        reads = []
+
+        def record_reads(execute, sql, params, many, context):
+            if (
+                sql.startswith("SELECT")
+                and 'FROM "book_sessions_readingsession"' in sql
+            ):
+                reads.append(connection.in_atomic_block)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record_reads):
+            archived = ReadingSessionArchiveService.archive_sessions(
+                older_than=timedelta(days=180), chunk_size=2
+            )
+
+        self.assertEqual(archived, len(reading_sessions))
+        # Two chunks and the empty read that ends the loop
+        self.assertEqual(reads, [True, True, True])
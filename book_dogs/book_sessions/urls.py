@@ -0,0 +1,8 @@
+from rest_framework.routers import DefaultRouter
+from .views import BookSessionViewSet, ReadingSessionViewSet
+
+router = DefaultRouter()
+router.register("book-sessions", BookSessionViewSet, basename="book-session")
+router.register("reading-sessions", ReadingSessionViewSet, basename="reading-session")
+
+urlpatterns = router.urls
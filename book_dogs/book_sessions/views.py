@@ -5,18 +5,35 @@ from rest_framework.permissions import IsAuthenticated
 from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 
-from .models import BookSession, ReadingSession
-from .serializers import BookSessionSerializer, ReadingSessionSerializer
-from .services import BookSessionService, ReadingSessionService
+from .forecasting import ReadingForecastService
+from .models import ArchivedReadingSession, BookSession, ReadingSession
+from .serializers import (
+    ArchivedReadingSessionSerializer,
+    BookSessionSerializer,
+    ReadingSessionSerializer,
+)
+from .services import (
+    BookSessionService,
+    ReadingSessionArchiveService,
+    ReadingSessionService,
+)
+from shared.concurrency.single_flight import SingleFlight
 from shared.permissions.is_owner import IsOwner
 
+# Concurrent statistics requests for the same book share one computation
+statistics_flight = SingleFlight()
+
 
 class BookSessionViewSet(viewsets.ModelViewSet):
     serializer_class = BookSessionSerializer
     permission_classes = [IsAuthenticated, IsOwner]
+    # Set per action, see ScopedSlidingWindowThrottle
+    throttle_scope = None
 
     def get_queryset(self):
-        return BookSession.objects.filter(owner=self.request.user)
+        return BookSession.objects.filter(owner=self.request.user).select_related(
+            "archive_summary"
+        )
 
     def perform_create(self, serializer):
         try:
@@ -40,12 +57,36 @@ class BookSessionViewSet(viewsets.ModelViewSet):
     def perform_destroy(self, instance):
         BookSessionService.delete_book_session(instance)
 
-    @action(detail=True, methods=["get"])
+    @action(detail=True, methods=["get"], throttle_scope="statistics")
     def statistics(self, request, pk=None):
         book_session = self.get_object()
-        stats = BookSessionService.get_reading_statistics(book_session)
+        stats = statistics_flight.do(
+            f"book-statistics:{book_session.pk}",
+            lambda: BookSessionService.get_reading_statistics(book_session),
+        )
         return Response(stats)
 
+    @action(detail=False, methods=["get"])
+    def forecast(self, request):
+        """Projected finish dates for every unfinished book"""
+        return Response(ReadingForecastService.get_forecasts(request.user))
+
+    @action(detail=True, methods=["get"])
+    def history(self, request, pk=None):
+        """All reading sessions of this book, archived ones included"""
+        book_session = self.get_object()
+        history = ReadingSessionArchiveService.get_history(book_session)
+        return Response(
+            [
+                (
+                    ArchivedReadingSessionSerializer(session).data
+                    if isinstance(session, ArchivedReadingSession)
+                    else ReadingSessionSerializer(session).data
+                )
+                for session in history
+            ]
+        )
+
     @action(detail=True, methods=["post"])
     def start_reading(self, request, pk=None):
         """Start a new reading session"""
@@ -63,6 +104,7 @@ class BookSessionViewSet(viewsets.ModelViewSet):
 class ReadingSessionViewSet(viewsets.ModelViewSet):
     serializer_class = ReadingSessionSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = None
 
     def get_queryset(self):
         return ReadingSession.objects.filter(
@@ -117,7 +159,7 @@ class ReadingSessionViewSet(viewsets.ModelViewSet):
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-    @action(detail=True, methods=["get"])
+    @action(detail=True, methods=["get"], throttle_scope="statistics")
     def statistics(self, request, pk=None):
         """Get session statistics"""
         reading_session = self.get_object()
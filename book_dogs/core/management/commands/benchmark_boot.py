@@ -0,0 +1,41 @@
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import ENTRYPOINTS, run_boot_probe
+
+
+class Command(BaseCommand):
+    help = "Time worker boot in fresh interpreters; fail past --max-seconds"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--entrypoint", choices=ENTRYPOINTS, default="wsgi")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--max-seconds",
+            type=float,
+            help="Exit with an error when the median boot is slower than this",
+        )
+
+    def handle(self, *args, **options):
+        runs = [
+            run_boot_probe(options["entrypoint"])[0] for _ in range(options["repeat"])
+        ]
+        totals = [run["total"] for run in runs]
+        median = statistics.median(totals)
+
+        self.stdout.write(
+            f"{options['entrypoint']} boot: "
+            f"best {min(totals) * 1000:.1f} ms, "
+            f"median {median * 1000:.1f} ms "
+            f"over {options['repeat']} runs"
+        )
+        for phase in runs[0]["phases"]:
+            phase_median = statistics.median(run["phases"][phase] for run in runs)
+            self.stdout.write(f"  {phase:<24} {phase_median * 1000:>9.1f} ms")
+
+        max_seconds = options["max_seconds"]
+        if max_seconds is not None and median > max_seconds:
+            raise CommandError(
+                f"Median boot {median:.3f}s exceeds the {max_seconds:.3f}s budget"
+            )
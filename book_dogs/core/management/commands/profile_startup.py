@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from core.startup import ENTRYPOINTS, group_by_package, run_boot_probe
+
+
+class Command(BaseCommand):
+    help = "Report where a fresh worker spends its boot time, per phase and import"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--entrypoint", choices=ENTRYPOINTS, default="wsgi")
+        parser.add_argument("--limit", type=int, default=15)
+
+    def handle(self, *args, **options):
+        timings, records = run_boot_probe(options["entrypoint"], importtime=True)
+        limit = options["limit"]
+
+        self.stdout.write(
+            f"Boot ({options['entrypoint']}): {timings['total'] * 1000:.1f} ms"
+            " (with -X importtime overhead)"
+        )
+        for phase, seconds in timings["phases"].items():
+            self.stdout.write(f"  {phase:<24} {seconds * 1000:>9.1f} ms")
+
+        self.stdout.write("\nImport time by package (self):")
+        for package, self_us in group_by_package(records)[:limit]:
+            self.stdout.write(f"  {package:<40} {self_us / 1000:>9.1f} ms")
+
+        self.stdout.write("\nSlowest imports (cumulative):")
+        slowest = sorted(records, key=lambda record: record[2], reverse=True)
+        for module, _, cumulative_us in slowest[:limit]:
+            self.stdout.write(f"  {module:<40} {cumulative_us / 1000:>9.1f} ms")
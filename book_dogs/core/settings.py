@@ -42,15 +42,29 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt",
     "users",
     "book_sessions",
+    "leaderboards",
+    "recommendations",
+    "core",
 ]
 
 AUTH_USER_MODEL = "users.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "shared.authentication.jwt.ProfileJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_THROTTLE_CLASSES": (
+        "shared.throttling.sliding_window.AnonSlidingWindowThrottle",
+        "shared.throttling.sliding_window.UserSlidingWindowThrottle",
+        "shared.throttling.sliding_window.ScopedSlidingWindowThrottle",
+    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "100/min",  # per IP
+        "user": "1000/min",  # per user
+        "token": "10/min",  # per IP, password hashing on every call
+        "statistics": "30/min",  # per user, heavy aggregation
+    },
 }
 
 SIMPLE_JWT = {
@@ -64,8 +78,38 @@ SIMPLE_JWT = {
     "LEEWAY": 0,
 }
 
+# Post-commit background tasks (shared.tasks). Swap BACKEND for a
+# broker-backed implementation of shared.tasks.backends.BaseTaskBackend.
+TASKS = {
+    "BACKEND": "shared.tasks.backends.ThreadPoolTaskBackend",
+    "OPTIONS": {
+        "max_workers": 4,
+        "max_queue_size": 1000,
+    },
+    "IDEMPOTENCY_TIMEOUT": 60 * 60 * 24,
+}
+
+# Reading sessions with no activity for this long are closed by the
+# close_stale_sessions command (run from cron, e.g. every 15 minutes) and
+# credited with at most STALE_SESSION_MAX_DURATION.
+STALE_SESSION_IDLE_THRESHOLD = timedelta(hours=12)
+STALE_SESSION_MAX_DURATION = timedelta(hours=2)
+
+# Sessions of finished books that ended longer ago than this are moved to
+# the archive tables by archive_reading_sessions.
+READING_SESSION_ARCHIVE_AFTER = timedelta(days=180)
+
+# core.wsgi/core.asgi warm up URL resolvers, serializers and DB connections
+# before the worker takes traffic. Don't open connections when the server
+# loads the app before forking (gunicorn --preload): workers would share them.
+# Warmed connections are only reused by a request served on the thread that
+# opened them (sync workers) and within CONN_MAX_AGE, see DATABASES.
+WARM_UP_ON_BOOT = True
+WARM_UP_CONNECTIONS = True
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "shared.db.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -97,11 +141,48 @@ WSGI_APPLICATION = "core.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connections outlive a request (otherwise request_started closes the one
+# opened by the warm-up); a connection that went away is replaced on first use.
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
+    },
+    # Read replica. Locally a second connection to the same SQLite file stands
+    # in for it. Tests get a separate database for it, so a read routed to the
+    # wrong side can't go unnoticed.
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
+        "TEST": {"NAME": "file:memorydb_replica?mode=memory&cache=shared"},
+    },
+}
+
+DATABASE_ROUTERS = ["shared.db.routers.PrimaryReplicaRouter"]
+DATABASE_REPLICA_ALIAS = "replica"
+# Seconds a user's reads stay on the primary after one of their writes
+READ_YOUR_WRITES_WINDOW = 5
+
+# Cache for state every worker process has to see: throttle counters and
+# cached forecasts. It can't be a per-process cache (checked by
+# shared.cache.checks), and should be Redis or Memcached in production since
+# the throttles hit it on every request.
+SHARED_CACHE = "shared"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Visible to all worker processes. The table is created by core's
+    # migrations; Redis or Memcached can take over without code changes.
+    "shared": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "shared_cache",
+    },
 }
 
 
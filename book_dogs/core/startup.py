@@ -0,0 +1,103 @@
+"""Worker boot measurements.
+
+Boot time can only be measured in a fresh interpreter, so the management
+commands run this module as a subprocess (``python -m core.startup wsgi``).
+It boots the app the way ``core.wsgi``/``core.asgi`` do, phase by phase, and
+prints the timings as JSON.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+ENTRYPOINTS = ("wsgi", "asgi")
+
+
+def measure_boot(entrypoint):
+    started = time.perf_counter()
+    phases = {}
+
+    import django
+
+    phase_started = time.perf_counter()
+    django.setup(set_prefix=False)
+    phases["apps_ready"] = time.perf_counter() - phase_started
+
+    phase_started = time.perf_counter()
+    if entrypoint == "asgi":
+        from django.core.handlers.asgi import ASGIHandler
+
+        ASGIHandler()
+    else:
+        from django.core.handlers.wsgi import WSGIHandler
+
+        WSGIHandler()
+    phases["handler"] = time.perf_counter() - phase_started
+
+    from django.conf import settings
+
+    from core.warmup import warm_up
+
+    if settings.WARM_UP_ON_BOOT:
+        open_connections = entrypoint == "wsgi" and settings.WARM_UP_CONNECTIONS
+        for step, seconds in warm_up(open_connections).items():
+            phases[f"warm_up_{step}"] = seconds
+
+    return {"total": time.perf_counter() - started, "phases": phases}
+
+
+def run_boot_probe(entrypoint, importtime=False):
+    """Boot the app in a fresh interpreter.
+
+    Returns the boot timings and, with ``importtime``, a
+    ``(module, self_us, cumulative_us)`` tuple per imported module as
+    reported by ``python -X importtime``.
+    """
+    from django.conf import settings
+
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-m", "core.startup", entrypoint]
+
+    result = subprocess.run(
+        command,
+        cwd=settings.BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Anything printed while booting comes before the JSON line
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    records = parse_importtime(result.stderr) if importtime else []
+    return timings, records
+
+
+def parse_importtime(output):
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # Column header
+            continue
+        records.append((module.strip(), int(self_us), int(cumulative_us)))
+    return records
+
+
+def group_by_package(records):
+    """Total self time per top-level package, slowest first"""
+    totals = defaultdict(int)
+    for module, self_us, _ in records:
+        totals[module.partition(".")[0]] += self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    entrypoint = sys.argv[1] if len(sys.argv) > 1 else "wsgi"
+    print(json.dumps(measure_boot(entrypoint)))
@@ -0,0 +1,95 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.signals import request_started
+from django.db import OperationalError, connections
+from django.test import SimpleTestCase
+
+from .startup import group_by_package, parse_importtime
+from .warmup import warm_up
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1500 |       2000 | django
+import time:       500 |        500 |   django.utils
+import time:       300 |        300 | rest_framework
+some other line on stderr
+"""
+
+
+class BenchmarkBootTests(SimpleTestCase):
+    def benchmark_boot(self, **options):
+        stdout = StringIO()
+        call_command("benchmark_boot", repeat=1, stdout=stdout, **options)
+        return stdout.getvalue()
+
+    def test_boot_within_budget(self):
+        # Generous: this guards the command, not the machine running the tests
+        output = self.benchmark_boot(max_seconds=30)
+
+        self.assertIn("wsgi boot:", output)
+        for phase in ("apps_ready", "handler", "warm_up_urls"):
+            self.assertIn(phase, output)
+
+    def test_boot_over_budget_fails(self):
+        with self.assertRaisesMessage(CommandError, "exceeds the 0.000s budget"):
+            self.benchmark_boot(max_seconds=0)
+
+
+class ImportTimeTests(SimpleTestCase):
+    def test_parse_importtime_skips_header_and_other_lines(self):
+        self.assertEqual(
+            parse_importtime(IMPORTTIME_OUTPUT),
+            [
+                ("_io", 120, 120),
+                ("django", 1500, 2000),
+                ("django.utils", 500, 500),
+                ("rest_framework", 300, 300),
+            ],
+        )
+
+    def test_group_by_package_slowest_first(self):
+        self.assertEqual(
+            group_by_package(parse_importtime(IMPORTTIME_OUTPUT)),
+            [("django", 2000), ("rest_framework", 300), ("_io", 120)],
+        )
+
+
+class WarmUpTests(SimpleTestCase):
+    databases = {"default", "replica"}
+
+    def test_returns_seconds_per_step(self):
+        timings = warm_up()
+
+        self.assertEqual(set(timings), {"urls", "serializers", "connections"})
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
+
+    def test_connections_can_be_left_closed(self):
+        self.assertNotIn("connections", warm_up(open_connections=False))
+
+    def test_unreachable_database_doesnt_stop_boot(self):
+        replica = connections["replica"]
+        with (
+            mock.patch.object(
+                replica, "ensure_connection", side_effect=OperationalError("down")
+            ),
+            self.assertLogs("core.warmup", "WARNING") as logs,
+        ):
+            timings = warm_up()
+
+        self.assertIn("connections", timings)
+        self.assertIn("'replica'", logs.output[0])
+
+    def test_warmed_up_connections_survive_request_started(self):
+        warm_up()
+
+        for alias in connections:
+            with self.subTest(alias=alias):
+                connection = connections[alias]
+                with mock.patch.object(connection, "close") as close:
+                    request_started.send(sender=self.__class__)
+                close.assert_not_called()
+                self.assertIsNotNone(connection.connection)
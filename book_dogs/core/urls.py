@@ -17,11 +17,17 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import TokenRefreshView
+from users.views import ThrottledTokenObtainPairView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("api/token", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path(
+        "api/token", ThrottledTokenObtainPairView.as_view(), name="token_obtain_pair"
+    ),
     path("api/token/refresh", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/users/", include("users.urls")),
+    path("api/", include("book_sessions.urls")),
+    path("api/leaderboards/", include("leaderboards.urls")),
+    path("api/recommendations/", include("recommendations.urls")),
 ]
@@ -0,0 +1,69 @@
+import logging
+import time
+
+from django.db import connections
+from django.urls import URLResolver, get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up(open_connections=True):
+    """Do the work a worker's first requests would otherwise pay for.
+
+    Compiles every URL pattern, builds the fields of each serializer the
+    routed views use (filling the model ``_meta`` caches on the way) and opens
+    the database connections. Returns the seconds spent on each step.
+    """
+    timings = {}
+
+    started = time.perf_counter()
+    resolver = get_resolver()
+    # Populating the reverse lookups compiles every pattern's regex
+    resolver.reverse_dict
+    timings["urls"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for serializer_class in _routed_serializer_classes(resolver):
+        try:
+            serializer_class().fields
+        except Exception:
+            logger.warning(
+                "Could not warm up %s", serializer_class.__name__, exc_info=True
+            )
+    timings["serializers"] = time.perf_counter() - started
+
+    if open_connections:
+        started = time.perf_counter()
+        for connection in connections.all():
+            try:
+                connection.ensure_connection()
+            except Exception:
+                # The worker still starts; its first request connects
+                logger.warning(
+                    "Could not connect to database %r", connection.alias, exc_info=True
+                )
+        timings["connections"] = time.perf_counter() - started
+
+    return timings
+
+
+def _routed_serializer_classes(resolver):
+    serializer_classes = set()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            serializer_classes |= _routed_serializer_classes(pattern)
+            continue
+
+        # DRF views, viewsets included, keep their class on the callback
+        view_class = getattr(pattern.callback, "cls", None)
+        if view_class is None:
+            continue
+
+        candidates = [getattr(view_class, "serializer_class", None)]
+        if hasattr(view_class, "get_extra_actions"):
+            candidates += [
+                extra_action.kwargs.get("serializer_class")
+                for extra_action in view_class.get_extra_actions()
+            ]
+        serializer_classes.update(filter(None, candidates))
+    return serializer_classes
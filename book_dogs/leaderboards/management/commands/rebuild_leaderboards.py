@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from leaderboards.models import LeaderboardEntry
+from leaderboards.services import LeaderboardService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute leaderboards and readers' ranks from reading sessions. Run "
+        "periodically (e.g. hourly from cron) to correct drift from incremental "
+        "updates; ranks are only as fresh as the last run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--period",
+            choices=[period for period, _ in LeaderboardEntry.PERIOD_CHOICES],
+            help="Only rebuild this period (default: all)",
+        )
+        parser.add_argument(
+            "--previous",
+            action="store_true",
+            help="Also rebuild the previous period, for sessions ended late",
+        )
+
+    def handle(self, *args, **options):
+        periods = (
+            [options["period"]]
+            if options["period"]
+            else [period for period, _ in LeaderboardEntry.PERIOD_CHOICES]
+        )
+
+        for period in periods:
+            start = LeaderboardService.period_start(period)
+            starts = [start]
+            if options["previous"]:
+                starts.append(LeaderboardService.previous_period_start(period, start))
+
+            for period_start in starts:
+                count = LeaderboardService.rebuild(period, period_start)
+                self.stdout.write(
+                    f"Rebuilt {period} leaderboard starting {period_start}: "
+                    f"{count} entries"
+                )
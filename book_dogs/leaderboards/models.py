@@ -0,0 +1,40 @@
+from django.db import models
+from users.models import User
+
+# Create your models here.
+
+
+class LeaderboardEntry(models.Model):
+    """Pages read by a user in one period, on the global or a city board"""
+
+    WEEK = "week"
+    MONTH = "month"
+    PERIOD_CHOICES = [(WEEK, "Week"), (MONTH, "Month")]
+
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    # Empty for the global board
+    city = models.CharField(max_length=255, blank=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="leaderboard_entries"
+    )
+    pages_read = models.PositiveIntegerField(default=0)
+    # Position on the board as of the last rebuild (ties share a rank), None
+    # for entries created since
+    rank = models.PositiveIntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "period_start", "city", "user"],
+                name="unique_leaderboard_entry",
+            ),
+        ]
+        indexes = [
+            # Serves top-N in index order
+            models.Index(
+                fields=["period", "period_start", "city", "-pages_read"],
+                name="leaderboard_rank_idx",
+            ),
+        ]
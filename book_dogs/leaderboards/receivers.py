@@ -0,0 +1,8 @@
+from django.dispatch import receiver
+from book_sessions.signals import reading_session_ended
+from .services import LeaderboardService
+
+
+@receiver(reading_session_ended)
+def update_leaderboards(sender, reading_session, **kwargs):
+    LeaderboardService.record_session(reading_session)
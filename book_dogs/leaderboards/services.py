@@ -0,0 +1,193 @@
+from datetime import datetime, time, timedelta
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from book_sessions.models import ReadingSession
+from users.models import Profile
+from .models import LeaderboardEntry
+
+
+class LeaderboardService:
+    REBUILD_BATCH_SIZE = 1000
+
+    @staticmethod
+    def period_start(period, moment=None):
+        day = timezone.localtime(moment).date()
+        if period == LeaderboardEntry.WEEK:
+            return day - timedelta(days=day.weekday())
+        return day.replace(day=1)
+
+    @staticmethod
+    def period_bounds(period, start):
+        if period == LeaderboardEntry.WEEK:
+            end = start + timedelta(days=7)
+        else:
+            end = (start + timedelta(days=32)).replace(day=1)
+
+        tz = timezone.get_current_timezone()
+        return (
+            datetime.combine(start, time.min, tzinfo=tz),
+            datetime.combine(end, time.min, tzinfo=tz),
+        )
+
+    @staticmethod
+    def previous_period_start(period, start):
+        if period == LeaderboardEntry.WEEK:
+            return start - timedelta(days=7)
+        return (start - timedelta(days=1)).replace(day=1)
+
+    @staticmethod
+    def record_session(reading_session):
+        """Add an ended session's pages to the boards it counts towards"""
+        if not reading_session.pages_read or reading_session.end_time is None:
+            return
+
+        # Session-ended receivers can be retried; count each session once
+        counted_key = f"leaderboards:counted:{reading_session.pk}"
+        if not cache.add(counted_key, True, 60 * 60 * 24 * 32):
+            return
+
+        user_id = reading_session.book_session.owner_id
+        city = (
+            Profile.objects.filter(user_id=user_id)
+            .values_list("city", flat=True)
+            .first()
+        )
+        boards = {"", city} if city else {""}
+
+        try:
+            with transaction.atomic():
+                for period, _ in LeaderboardEntry.PERIOD_CHOICES:
+                    start = LeaderboardService.period_start(
+                        period, reading_session.end_time
+                    )
+                    for board in boards:
+                        LeaderboardService._increment(
+                            period, start, board, user_id, reading_session.pages_read
+                        )
+        except Exception:
+            cache.delete(counted_key)
+            raise
+
+    @staticmethod
+    def _increment(period, start, city, user_id, pages):
+        entries = LeaderboardEntry.objects.filter(
+            period=period, period_start=start, city=city, user_id=user_id
+        )
+        if entries.update(pages_read=F("pages_read") + pages):
+            return
+
+        try:
+            with transaction.atomic():
+                LeaderboardEntry.objects.create(
+                    period=period,
+                    period_start=start,
+                    city=city,
+                    user_id=user_id,
+                    pages_read=pages,
+                )
+        except IntegrityError:
+            # Lost the race to create it
+            entries.update(pages_read=F("pages_read") + pages)
+
+    @staticmethod
+    def rebuild(period, start=None):
+        """Recompute one period's boards from the reading sessions.
+
+        Incremental updates miss deleted or edited sessions, so this runs
+        periodically to put the boards back in line with the source data.
+        It also stores each entry's rank, which get_rank serves as is.
+        """
+        start = start or LeaderboardService.period_start(period)
+        period_from, period_to = LeaderboardService.period_bounds(period, start)
+
+        totals = (
+            ReadingSession.objects.filter(
+                end_time__gte=period_from, end_time__lt=period_to, pages_read__gt=0
+            )
+            .values("book_session__owner_id", "book_session__owner__profile__city")
+            .annotate(pages=Sum("pages_read"))
+            # Best first, so each board's ranks are counted on the way
+            .order_by("-pages")
+        )
+
+        count = 0
+        batch = []
+        # Board -> (entries so far, pages of the last one, its rank)
+        positions = {}
+        with transaction.atomic():
+            LeaderboardEntry.objects.filter(period=period, period_start=start).delete()
+            for row in totals.iterator():
+                user_id = row["book_session__owner_id"]
+                city = row["book_session__owner__profile__city"]
+                for board in {"", city} if city else {""}:
+                    seen, last_pages, last_rank = positions.get(board, (0, None, 0))
+                    seen += 1
+                    # Ties share a rank, the next reader skips ahead
+                    rank = last_rank if row["pages"] == last_pages else seen
+                    positions[board] = (seen, row["pages"], rank)
+                    batch.append(
+                        LeaderboardEntry(
+                            period=period,
+                            period_start=start,
+                            city=board,
+                            user_id=user_id,
+                            pages_read=row["pages"],
+                            rank=rank,
+                        )
+                    )
+
+                if len(batch) >= LeaderboardService.REBUILD_BATCH_SIZE:
+                    LeaderboardEntry.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+
+            LeaderboardEntry.objects.bulk_create(batch)
+            count += len(batch)
+        return count
+
+    @staticmethod
+    def get_top(period, city="", limit=10, start=None):
+        start = start or LeaderboardService.period_start(period)
+        entries = (
+            LeaderboardEntry.objects.filter(
+                period=period, period_start=start, city=city
+            )
+            .select_related("user")
+            .order_by("-pages_read", "user_id")[:limit]
+        )
+
+        top = []
+        for position, entry in enumerate(entries, start=1):
+            # Same ranking as rebuild(): ties share a rank
+            tied = top and top[-1]["pages_read"] == entry.pages_read
+            top.append(
+                {
+                    "rank": top[-1]["rank"] if tied else position,
+                    "user_id": entry.user_id,
+                    "username": entry.user.username,
+                    "pages_read": entry.pages_read,
+                }
+            )
+        return top
+
+    @staticmethod
+    def get_rank(user, period, city="", start=None):
+        """The user's rank as stored by the last rebuild().
+
+        One lookup on the unique (board, user) index, whatever the rank. The
+        rank lags behind pages_read until the next rebuild_leaderboards run
+        and is None for a user who joined the board since.
+        """
+        start = start or LeaderboardService.period_start(period)
+        entry = (
+            LeaderboardEntry.objects.filter(
+                period=period, period_start=start, city=city, user=user
+            )
+            .values("rank", "pages_read")
+            .first()
+        )
+        if entry is None:
+            return None
+        return {"rank": entry["rank"], "pages_read": entry["pages_read"]}
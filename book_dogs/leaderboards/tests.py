@@ -0,0 +1,228 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from book_sessions.models import BookSession, ReadingSession
+from users.models import Profile, User
+from .models import LeaderboardEntry
+from .services import LeaderboardService
+
+WEEK = LeaderboardEntry.WEEK
+MONTH = LeaderboardEntry.MONTH
+
+
+class LeaderboardTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now()
+
+    def create_reader(self, name, city=""):
+        user = User.objects.create_user(username=name, email=f"{name}@example.com")
+        Profile.objects.create(user=user, city=city)
+        book = BookSession.objects.create(
+            owner=user,
+            title="Dune",
+            description="d",
+            page_number=1000,
+            author="a",
+            genre="g",
+        )
+        return user, book
+
+    def end_session(self, book, pages_read, end_time=None):
+        end_time = end_time or self.now
+        return ReadingSession.objects.create(
+            book_session=book,
+            pages_read=pages_read,
+            end_time=end_time,
+        )
+
+    def board(self, period=WEEK, city=""):
+        return dict(
+            LeaderboardEntry.objects.filter(
+                period=period,
+                period_start=LeaderboardService.period_start(period, self.now),
+                city=city,
+            ).values_list("user__username", "pages_read")
+        )
+
+
+class RecordSessionTests(LeaderboardTestCase):
+    def test_counts_towards_global_and_city_boards(self):
+        _, book = self.create_reader("ana", city="Lisbon")
+
+        LeaderboardService.record_session(self.end_session(book, 30))
+        LeaderboardService.record_session(self.end_session(book, 20))
+
+        for period in (WEEK, MONTH):
+            self.assertEqual(self.board(period), {"ana": 50})
+            self.assertEqual(self.board(period, "Lisbon"), {"ana": 50})
+        self.assertEqual(self.board(city="Porto"), {})
+
+    def test_no_city_board_without_city(self):
+        _, book = self.create_reader("ana")
+        LeaderboardService.record_session(self.end_session(book, 30))
+        self.assertEqual(
+            set(LeaderboardEntry.objects.values_list("city", flat=True)), {""}
+        )
+
+    def test_each_session_counted_once(self):
+        _, book = self.create_reader("ana", city="Lisbon")
+        reading_session = self.end_session(book, 30)
+
+        LeaderboardService.record_session(reading_session)
+        LeaderboardService.record_session(reading_session)
+
+        self.assertEqual(self.board(), {"ana": 30})
+        self.assertEqual(self.board(city="Lisbon"), {"ana": 30})
+
+    def test_ignores_active_and_empty_sessions(self):
+        _, book = self.create_reader("ana")
+        LeaderboardService.record_session(
+            ReadingSession.objects.create(book_session=book, pages_read=10)
+        )
+        LeaderboardService.record_session(self.end_session(book, 0))
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+
+class RebuildTests(LeaderboardTestCase):
+    def test_recomputes_boards_from_sessions(self):
+        ana, ana_book = self.create_reader("ana", city="Lisbon")
+        _, bo_book = self.create_reader("bo", city="Porto")
+        self.end_session(ana_book, 30)
+        self.end_session(ana_book, 20)
+        self.end_session(bo_book, 10)
+        # Outside the week
+        self.end_session(bo_book, 99, self.now - timedelta(days=8))
+        # Stale entry, e.g. from a session deleted since
+        LeaderboardEntry.objects.create(
+            period=WEEK,
+            period_start=LeaderboardService.period_start(WEEK, self.now),
+            city="",
+            user=ana,
+            pages_read=500,
+        )
+
+        start = LeaderboardService.period_start(WEEK, self.now)
+        created = LeaderboardService.rebuild(WEEK, start)
+
+        self.assertEqual(created, 4)
+        self.assertEqual(self.board(), {"ana": 50, "bo": 10})
+        self.assertEqual(self.board(city="Lisbon"), {"ana": 50})
+        self.assertEqual(self.board(city="Porto"), {"bo": 10})
+
+    def test_batches(self):
+        for i in range(5):
+            _, book = self.create_reader(f"reader{i}")
+            self.end_session(book, 10 + i)
+
+        start = LeaderboardService.period_start(WEEK, self.now)
+        with mock.patch.object(LeaderboardService, "REBUILD_BATCH_SIZE", 2):
+            created = LeaderboardService.rebuild(WEEK, start)
+
+        self.assertEqual(created, 5)
+        self.assertEqual(len(self.board()), 5)
+
+
+class RankedReadersTestCase(LeaderboardTestCase):
+    def setUp(self):
+        super().setUp()
+        self.readers = {}
+        for name, pages_read in (("ana", 50), ("bo", 50), ("cy", 30), ("di", 10)):
+            user, book = self.create_reader(name, city="Lisbon")
+            self.readers[name] = user
+            LeaderboardService.record_session(self.end_session(book, pages_read))
+        # Ranks are stored by the rebuild
+        LeaderboardService.rebuild(WEEK, LeaderboardService.period_start(WEEK))
+
+
+class RankingTests(RankedReadersTestCase):
+    def test_ties_share_a_rank(self):
+        top = LeaderboardService.get_top(WEEK, limit=10)
+        self.assertEqual(
+            [(entry["rank"], entry["username"]) for entry in top],
+            [(1, "ana"), (1, "bo"), (3, "cy"), (4, "di")],
+        )
+
+    def test_rank_matches_top(self):
+        for name, rank in (("ana", 1), ("bo", 1), ("cy", 3), ("di", 4)):
+            with self.subTest(name=name):
+                self.assertEqual(
+                    LeaderboardService.get_rank(self.readers[name], WEEK)["rank"],
+                    rank,
+                )
+
+    def test_rank_is_one_lookup(self):
+        with self.assertNumQueries(1):
+            LeaderboardService.get_rank(self.readers["di"], WEEK)
+
+    def test_city_ranks(self):
+        _, book = self.create_reader("fay", city="Porto")
+        self.end_session(book, 40)
+        LeaderboardService.rebuild(WEEK, LeaderboardService.period_start(WEEK))
+
+        rank = LeaderboardService.get_rank
+        self.assertEqual(rank(self.readers["cy"], WEEK)["rank"], 4)
+        self.assertEqual(rank(self.readers["cy"], WEEK, city="Lisbon")["rank"], 3)
+        self.assertEqual(rank(self.readers["di"], WEEK, city="Lisbon")["rank"], 4)
+        self.assertIsNone(rank(self.readers["cy"], WEEK, city="Porto"))
+
+    def test_rank_lags_until_rebuild(self):
+        di = self.readers["di"]
+        _, book = self.create_reader("ed", city="Lisbon")
+        LeaderboardService.record_session(self.end_session(book, 5))
+        LeaderboardService.record_session(self.end_session(di.book_sessions.get(), 100))
+
+        self.assertEqual(
+            LeaderboardService.get_rank(di, WEEK), {"rank": 4, "pages_read": 110}
+        )
+        self.assertEqual(
+            LeaderboardService.get_rank(User.objects.get(username="ed"), WEEK),
+            {"rank": None, "pages_read": 5},
+        )
+
+        LeaderboardService.rebuild(WEEK, LeaderboardService.period_start(WEEK))
+        self.assertEqual(LeaderboardService.get_rank(di, WEEK)["rank"], 1)
+
+    def test_unranked_user(self):
+        user, _ = self.create_reader("ed")
+        self.assertIsNone(LeaderboardService.get_rank(user, WEEK))
+
+    def test_city_board_is_separate(self):
+        _, book = self.create_reader("fay", city="Porto")
+        LeaderboardService.record_session(self.end_session(book, 5))
+
+        top = LeaderboardService.get_top(WEEK, city="Porto")
+        self.assertEqual([entry["username"] for entry in top], ["fay"])
+        self.assertEqual(len(LeaderboardService.get_top(WEEK, city="Lisbon")), 4)
+
+
+@override_settings(DATABASE_REPLICA_ALIAS=None)
+class LeaderboardViewTests(RankedReadersTestCase):
+    def get(self, **params):
+        client = APIClient()
+        client.force_authenticate(self.readers["cy"])
+        return client.get("/api/leaderboards/", params)
+
+    def test_top_and_own_rank(self):
+        response = self.get(period="week", limit=2)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [entry["username"] for entry in response.data["top"]], ["ana", "bo"]
+        )
+        self.assertEqual(response.data["me"], {"rank": 3, "pages_read": 30})
+
+    def test_invalid_params(self):
+        for params in (
+            {"period": "year"},
+            {"limit": "ten"},
+            {"limit": "0"},
+            {"limit": "-5"},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.get(**params).status_code, 400)
@@ -0,0 +1,39 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+
+from .models import LeaderboardEntry
+from .services import LeaderboardService
+
+
+class LeaderboardView(APIView):
+    """Top readers for ?period=week|month, globally or for ?city="""
+
+    permission_classes = [IsAuthenticated]
+    max_limit = 100
+
+    def get(self, request):
+        period = request.query_params.get("period", LeaderboardEntry.WEEK)
+        if period not in dict(LeaderboardEntry.PERIOD_CHOICES):
+            raise ValidationError({"period": "Must be 'week' or 'month'"})
+
+        city = request.query_params.get("city", "")
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer"})
+        if limit < 1:
+            raise ValidationError({"limit": "Must be at least 1"})
+        limit = min(limit, self.max_limit)
+
+        start = LeaderboardService.period_start(period)
+        return Response(
+            {
+                "period": period,
+                "period_start": start,
+                "city": city,
+                "top": LeaderboardService.get_top(period, city, limit, start),
+                "me": LeaderboardService.get_rank(request.user, period, city, start),
+            }
+        )
@@ -0,0 +1,167 @@
+"""Offline "readers also read" builder.
+
+Books are identified by RecommendationService.book_key. The user x book
+matrix is sparse and binary; item-item cosine similarity is computed a block
+of items at a time so the dense item x item matrix never exists.
+"""
+
+from array import array
+
+import numpy as np
+from scipy import sparse
+from django.db import transaction
+
+from book_sessions.models import BookSession
+from .models import BookRecommendation, SimilarBook
+from .services import RecommendationService
+
+
+class RecommendationBuilder:
+    def __init__(self, top_k=20, chunk_size=2000, batch_size=5000, log=None):
+        self.top_k = top_k
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+
+    def build(self):
+        matrix, user_ids, books = self.load_matrix()
+        self.log(f"Loaded {matrix.shape[0]} readers x {matrix.shape[1]} books")
+
+        with transaction.atomic():
+            SimilarBook.objects.all().delete()
+            BookRecommendation.objects.all().delete()
+
+            neighbors = self.write_similar_books(matrix, books)
+            self.log(f"Stored neighbors for {len(books)} books")
+
+            self.write_user_recommendations(matrix, neighbors, user_ids, books)
+            self.log(f"Stored recommendations for {len(user_ids)} readers")
+
+    def load_matrix(self):
+        """Stream book sessions into a binary reader x book CSR matrix"""
+        user_rows, book_columns = {}, {}
+        books = []  # (key, title, author, genre) by column
+        rows, columns = array("q"), array("q")
+
+        book_sessions = (
+            BookSession.objects.order_by()
+            .values_list("owner_id", "title", "author", "genre")
+            .iterator(chunk_size=self.batch_size)
+        )
+        for owner_id, title, author, genre in book_sessions:
+            key = RecommendationService.book_key(title, author)
+            if key not in book_columns:
+                book_columns[key] = len(books)
+                books.append((key, title.strip(), author.strip(), genre))
+            rows.append(user_rows.setdefault(owner_id, len(user_rows)))
+            columns.append(book_columns[key])
+
+        rows = np.frombuffer(rows, dtype=np.int64)
+        columns = np.frombuffer(columns, dtype=np.int64)
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+            shape=(len(user_rows), len(books)),
+        )
+        # Owning the same book twice still counts once
+        matrix.data[:] = 1
+        user_ids = np.fromiter(user_rows, dtype=np.int64, count=len(user_rows))
+        return matrix, user_ids, books
+
+    def write_similar_books(self, matrix, books):
+        """Top-K cosine neighbors per book, stored and returned as a sparse
+        book x book matrix for scoring readers"""
+        by_book = matrix.T.tocsr()
+        # Binary rows: the norm is the square root of the reader count
+        inverse_norms = 1 / np.sqrt(np.asarray(by_book.sum(axis=1)).ravel())
+        scale_columns = sparse.diags(inverse_norms)
+
+        rows, columns, scores = [], [], []
+        batch = []
+        for start in range(0, by_book.shape[0], self.chunk_size):
+            stop = min(start + self.chunk_size, by_book.shape[0])
+            # Co-readers of this block of books with every book
+            similarity = by_book[start:stop] @ matrix
+            similarity = (
+                sparse.diags(inverse_norms[start:stop]) @ similarity @ scale_columns
+            ).tocsr()
+            similarity.setdiag(0, k=start)
+            similarity.eliminate_zeros()
+
+            for offset, (neighbors, neighbor_scores) in enumerate(
+                self.top_k_rows(similarity)
+            ):
+                book = start + offset
+                rows.append(np.full(len(neighbors), book))
+                columns.append(neighbors)
+                scores.append(neighbor_scores)
+                batch.extend(
+                    SimilarBook(
+                        book_key=books[book][0],
+                        rank=rank,
+                        title=books[neighbor][1],
+                        author=books[neighbor][2],
+                        genre=books[neighbor][3],
+                        score=float(score),
+                    )
+                    for rank, (neighbor, score) in enumerate(
+                        zip(neighbors, neighbor_scores), start=1
+                    )
+                )
+            batch = self.flush(SimilarBook, batch)
+        self.flush(SimilarBook, batch, force=True)
+
+        size = len(books)
+        if not rows:
+            return sparse.csr_matrix((size, size), dtype=np.float32)
+        return sparse.csr_matrix(
+            (np.concatenate(scores), (np.concatenate(rows), np.concatenate(columns))),
+            shape=(size, size),
+        )
+
+    def write_user_recommendations(self, matrix, neighbors, user_ids, books):
+        """Score unread books for each reader by summing their books' neighbors"""
+        batch = []
+        for start in range(0, matrix.shape[0], self.chunk_size):
+            stop = min(start + self.chunk_size, matrix.shape[0])
+            read = matrix[start:stop]
+            candidates = (read @ neighbors).tocsr()
+            # Drop books the reader already has
+            candidates = candidates - candidates.multiply(read)
+            candidates.eliminate_zeros()
+
+            for offset, (recommended, recommended_scores) in enumerate(
+                self.top_k_rows(candidates)
+            ):
+                user_id = int(user_ids[start + offset])
+                batch.extend(
+                    BookRecommendation(
+                        user_id=user_id,
+                        rank=rank,
+                        title=books[book][1],
+                        author=books[book][2],
+                        genre=books[book][3],
+                        score=float(score),
+                    )
+                    for rank, (book, score) in enumerate(
+                        zip(recommended, recommended_scores), start=1
+                    )
+                )
+            batch = self.flush(BookRecommendation, batch)
+        self.flush(BookRecommendation, batch, force=True)
+
+    def top_k_rows(self, matrix):
+        """Yield (columns, values) of each row's top-K values, best first"""
+        for row in range(matrix.shape[0]):
+            begin, end = matrix.indptr[row], matrix.indptr[row + 1]
+            columns, values = matrix.indices[begin:end], matrix.data[begin:end]
+            if len(values) > self.top_k:
+                best = np.argpartition(values, -self.top_k)[-self.top_k :]
+                columns, values = columns[best], values[best]
+            order = np.argsort(-values, kind="stable")
+            yield columns[order], values[order]
+
+    def flush(self, model, batch, force=False):
+        if batch and (force or len(batch) >= self.batch_size):
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            return []
+        return batch
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recommendations.builder import RecommendationBuilder
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the "readers also read" neighbors and per-reader '
+        "recommendations from every book session."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-k", type=int, default=20)
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Books (or readers) scored per block; bounds peak memory",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        for option in ("top_k", "chunk_size", "batch_size"):
+            if options[option] <= 0:
+                raise CommandError(f"--{option.replace('_', '-')} must be positive")
+
+        started = time.monotonic()
+        RecommendationBuilder(
+            top_k=options["top_k"],
+            chunk_size=options["chunk_size"],
+            batch_size=options["batch_size"],
+            log=self.stdout.write,
+        ).build()
+        self.stdout.write(f"Done in {time.monotonic() - started:.1f}s")
@@ -0,0 +1,40 @@
+from django.db import models
+from users.models import User
+
+# Create your models here.
+
+
+class SimilarBook(models.Model):
+    """One of the top books read by readers of the book behind ``book_key``"""
+
+    book_key = models.CharField(max_length=40)
+    rank = models.PositiveSmallIntegerField()
+    title = models.CharField(max_length=255)
+    author = models.CharField(max_length=255)
+    genre = models.CharField(max_length=255)
+    score = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["book_key", "rank"], name="similarbook_lookup_idx"),
+        ]
+
+
+class BookRecommendation(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="book_recommendations",
+        db_index=False,
+    )
+    rank = models.PositiveSmallIntegerField()
+    title = models.CharField(max_length=255)
+    author = models.CharField(max_length=255)
+    genre = models.CharField(max_length=255)
+    score = models.FloatField()
+
+    class Meta:
+        indexes = [
+            # Also serves as the user foreign key index
+            models.Index(fields=["user", "rank"], name="recommendation_lookup_idx"),
+        ]
@@ -0,0 +1,14 @@
+from rest_framework import serializers
+from .models import BookRecommendation, SimilarBook
+
+
+class BookRecommendationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BookRecommendation
+        fields = ["rank", "title", "author", "genre", "score"]
+
+
+class SimilarBookSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SimilarBook
+        fields = ["rank", "title", "author", "genre", "score"]
@@ -0,0 +1,21 @@
+import hashlib
+from .models import BookRecommendation, SimilarBook
+
+
+class RecommendationService:
+    @staticmethod
+    def book_key(title, author):
+        """Identify a book across owners, whatever its casing or spacing"""
+        normalized = f"{title.strip().casefold()}\x1f{author.strip().casefold()}"
+        return hashlib.sha1(normalized.encode()).hexdigest()
+
+    @staticmethod
+    def get_for_user(user, limit=20):
+        return BookRecommendation.objects.filter(user=user).order_by("rank")[:limit]
+
+    @staticmethod
+    def get_similar(book_session, limit=20):
+        book_key = RecommendationService.book_key(
+            book_session.title, book_session.author
+        )
+        return SimilarBook.objects.filter(book_key=book_key).order_by("rank")[:limit]
@@ -0,0 +1,212 @@
+import math
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from book_sessions.models import BookSession
+from users.models import User
+from .builder import RecommendationBuilder
+from .models import BookRecommendation, SimilarBook
+from .services import RecommendationService
+
+# Reader -> books they own. Reader counts: A 3, B 3, C 2, D 1
+LIBRARIES = {
+    "ann": ["A", "B", "C"],
+    "bob": ["A", "B"],
+    "cat": ["B", "C", "D"],
+    # A second copy of the same book, cased and spaced differently
+    "dan": ["A", " a "],
+}
+
+
+def cosine(co_readers, readers, other_readers):
+    return co_readers / math.sqrt(readers * other_readers)
+
+
+class RecommendationBuilderTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {}
+        for username, titles in LIBRARIES.items():
+            user = User.objects.create_user(
+                username=username, email=f"{username}@example.com"
+            )
+            cls.users[username] = user
+            for title in titles:
+                BookSession.objects.create(
+                    owner=user,
+                    title=title,
+                    description="",
+                    page_number=100,
+                    author="Author",
+                    genre="genre",
+                )
+
+    def build(self, **options):
+        RecommendationBuilder(**options).build()
+
+    def similar(self, title):
+        book_key = RecommendationService.book_key(title, "Author")
+        return [
+            (book.title, book.score)
+            for book in SimilarBook.objects.filter(book_key=book_key).order_by("rank")
+        ]
+
+    def recommended(self, username):
+        return [
+            (book.title, book.score)
+            for book in BookRecommendation.objects.filter(
+                user=self.users[username]
+            ).order_by("rank")
+        ]
+
+    def assertScores(self, actual, expected):
+        self.assertEqual([title for title, _ in actual], [t for t, _ in expected])
+        for (_, score), (_, expected_score) in zip(actual, expected):
+            self.assertAlmostEqual(score, expected_score, places=5)
+
+
+class SimilarBooksTests(RecommendationBuilderTestCase):
+    def test_cosine_similarity_best_first(self):
+        self.build()
+
+        self.assertScores(
+            self.similar("B"),
+            [
+                ("C", cosine(2, 3, 2)),
+                ("A", cosine(2, 3, 3)),
+                ("D", cosine(1, 3, 1)),
+            ],
+        )
+        # Nobody read A and D together
+        self.assertScores(
+            self.similar("A"), [("B", cosine(2, 3, 3)), ("C", cosine(1, 3, 2))]
+        )
+
+    def test_duplicate_copies_count_once(self):
+        self.build()
+        # dan's two copies of A don't make A look more read
+        self.assertScores(
+            self.similar("D"), [("C", cosine(1, 1, 2)), ("B", cosine(1, 1, 3))]
+        )
+        self.assertFalse(SimilarBook.objects.filter(title__in=["a", " a "]).exists())
+
+    def test_keeps_top_k(self):
+        self.build(top_k=1)
+
+        self.assertScores(self.similar("B"), [("C", cosine(2, 3, 2))])
+        self.assertEqual(SimilarBook.objects.filter(rank__gt=1).count(), 0)
+
+    def test_chunk_boundaries_dont_change_the_result(self):
+        self.build(chunk_size=100)
+        expected = {title: self.similar(title) for title in "ABCD"}
+
+        # Smaller than, not dividing, and equal to the number of books
+        for chunk_size in (1, 3, 4):
+            with self.subTest(chunk_size=chunk_size):
+                self.build(chunk_size=chunk_size)
+                for title in "ABCD":
+                    self.assertScores(self.similar(title), expected[title])
+
+    def test_no_book_is_its_own_neighbor(self):
+        # Later blocks only get their diagonal cleared at the block offset
+        self.build(chunk_size=2)
+
+        for title in "ABCD":
+            neighbors = [neighbor for neighbor, _ in self.similar(title)]
+            self.assertNotIn(title, neighbors)
+
+    def test_rebuild_replaces_previous_results(self):
+        self.build()
+        self.build()
+
+        self.assertEqual(len(self.similar("B")), 3)
+        self.assertEqual(len(self.recommended("bob")), 2)
+
+
+class UserRecommendationsTests(RecommendationBuilderTestCase):
+    def test_scores_sum_neighbors_of_owned_books(self):
+        self.build()
+
+        self.assertScores(
+            self.recommended("bob"),
+            [
+                ("C", cosine(1, 3, 2) + cosine(2, 3, 2)),
+                ("D", cosine(1, 3, 1)),
+            ],
+        )
+
+    def test_excludes_owned_books(self):
+        self.build()
+
+        for username, titles in LIBRARIES.items():
+            owned = {title.strip().upper() for title in titles}
+            recommended = {title for title, _ in self.recommended(username)}
+            self.assertFalse(recommended & owned, username)
+        # ann already owns every book read alongside hers but D
+        self.assertEqual([title for title, _ in self.recommended("ann")], ["D"])
+
+    def test_chunk_boundaries_dont_change_the_result(self):
+        self.build(chunk_size=100)
+        expected = {username: self.recommended(username) for username in LIBRARIES}
+
+        for chunk_size in (1, 3):
+            with self.subTest(chunk_size=chunk_size):
+                self.build(chunk_size=chunk_size)
+                for username in LIBRARIES:
+                    self.assertScores(self.recommended(username), expected[username])
+
+    def test_flushes_every_batch_size_rows(self):
+        expected_rows = {}
+        self.build()
+        for model in (SimilarBook, BookRecommendation):
+            expected_rows[model] = model.objects.count()
+
+        for model in (SimilarBook, BookRecommendation):
+            with self.subTest(model=model.__name__):
+                manager = model.objects
+                with mock.patch.object(
+                    manager, "bulk_create", wraps=manager.bulk_create
+                ) as bulk_create:
+                    self.build(chunk_size=1, batch_size=2)
+
+                sizes = [len(call.args[0]) for call in bulk_create.call_args_list]
+                self.assertGreater(len(sizes), 1)
+                # Only the final flush may be smaller than a batch
+                self.assertTrue(all(size >= 2 for size in sizes[:-1]), sizes)
+                self.assertEqual(sum(sizes), expected_rows[model])
+                self.assertEqual(model.objects.count(), expected_rows[model])
+
+
+@override_settings(DATABASE_REPLICA_ALIAS=None)
+class RecommendationViewTests(RecommendationBuilderTestCase):
+    def setUp(self):
+        self.build()
+        self.client = APIClient()
+        self.client.force_authenticate(self.users["bob"])
+
+    def test_lists_own_recommendations(self):
+        response = self.client.get("/api/recommendations/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([book["title"] for book in response.json()], ["C", "D"])
+
+    def test_similar_books_of_own_book(self):
+        book_session = BookSession.objects.get(owner=self.users["bob"], title="B")
+
+        response = self.client.get(
+            f"/api/recommendations/book-sessions/{book_session.pk}/similar/"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([book["title"] for book in response.json()], ["C", "A", "D"])
+
+    def test_similar_books_of_someone_elses_book(self):
+        book_session = BookSession.objects.get(owner=self.users["cat"], title="D")
+
+        response = self.client.get(
+            f"/api/recommendations/book-sessions/{book_session.pk}/similar/"
+        )
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import RecommendationListView, SimilarBookListView
+
+urlpatterns = [
+    path("", RecommendationListView.as_view(), name="recommendations"),
+    path(
+        "book-sessions/<int:pk>/similar/",
+        SimilarBookListView.as_view(),
+        name="similar-books",
+    ),
+]
@@ -0,0 +1,30 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+
+from book_sessions.models import BookSession
+from .serializers import BookRecommendationSerializer, SimilarBookSerializer
+from .services import RecommendationService
+
+
+class RecommendationListView(generics.ListAPIView):
+    """Precomputed recommendations for the current user"""
+
+    serializer_class = BookRecommendationSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return RecommendationService.get_for_user(self.request.user)
+
+
+class SimilarBookListView(generics.ListAPIView):
+    """Readers of this book also read..."""
+
+    serializer_class = SimilarBookSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        book_session = get_object_or_404(
+            BookSession, pk=self.kwargs["pk"], owner=self.request.user
+        )
+        return RecommendationService.get_similar(book_session)
@@ -0,0 +1,22 @@
+from django.utils.text import capfirst
+
+
+class ServiceDeleteMixin:
+    """ModelAdmin mixin for models deleted through a set-based service.
+
+    The subclass routes ``delete_model`` and ``delete_queryset`` to the
+    service. Django's confirmation page would still collect the ORM cascade,
+    loading every related row only to list it, so just the selected objects
+    are listed. Delete permission is checked on those objects; what goes with
+    them is up to the service.
+    """
+
+    def get_deleted_objects(self, objs, request):
+        opts = self.model._meta
+        to_delete, perms_needed = [], set()
+        for obj in objs:
+            to_delete.append(f"{capfirst(opts.verbose_name)}: {obj}")
+            if not self.has_delete_permission(request, obj):
+                perms_needed.add(opts.verbose_name)
+        model_count = {opts.verbose_name_plural: len(to_delete)} if to_delete else {}
+        return to_delete, model_count, perms_needed, []
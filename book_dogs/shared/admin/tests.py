@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+
+from users.models import User
+from .paginators import EstimatedCountPaginator
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        for name in ("ann", "bob", "cat"):
+            User.objects.create_user(username=name, email=f"{name}@example.com")
+
+    def count(self, queryset):
+        return EstimatedCountPaginator(queryset, 10).count
+
+    def test_exact_count_off_postgresql(self):
+        self.assertEqual(self.count(User.objects.order_by("pk")), 3)
+        self.assertEqual(
+            self.count(User.objects.filter(username="ann").order_by("pk")), 1
+        )
+
+    @mock.patch.object(connection, "vendor", "postgresql")
+    def test_uses_catalog_estimate_when_unfiltered(self):
+        with mock.patch.object(
+            EstimatedCountPaginator, "_catalog_estimate", return_value=50_000
+        ) as catalog_estimate:
+            self.assertEqual(self.count(User.objects.order_by("pk")), 50_000)
+        catalog_estimate.assert_called_once()
+
+    @mock.patch.object(connection, "vendor", "postgresql")
+    def test_uses_planner_estimate_when_filtered(self):
+        with mock.patch.object(
+            EstimatedCountPaginator, "_planner_estimate", return_value=20_000
+        ) as planner_estimate:
+            self.assertEqual(
+                self.count(User.objects.filter(is_active=True).order_by("pk")), 20_000
+            )
+        planner_estimate.assert_called_once()
+
+    @mock.patch.object(connection, "vendor", "postgresql")
+    def test_small_estimates_get_the_exact_count(self):
+        with mock.patch.object(
+            EstimatedCountPaginator, "_planner_estimate", return_value=40
+        ):
+            self.assertEqual(
+                self.count(User.objects.filter(is_active=True).order_by("pk")), 3
+            )
+        with mock.patch.object(
+            EstimatedCountPaginator, "_catalog_estimate", return_value=None
+        ):
+            self.assertEqual(self.count(User.objects.order_by("pk")), 3)
@@ -0,0 +1,67 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from shared.db.routing import (
+    PRIMARY,
+    REPLICA,
+    get_read_target,
+    is_pinned_to_primary,
+    set_read_target,
+)
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """JWT authentication that loads the user's profile in the same query.
+
+    Same checks as ``JWTAuthentication.get_user``; the only difference is the
+    ``select_related`` so ``request.user.profile`` doesn't cost a second
+    round trip.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+
+        # Safe requests read from the replica, unless this user just wrote
+        # something (see ReplicaRoutingMiddleware).
+        if (
+            result is not None
+            and request.method in SAFE_METHODS
+            and get_read_target() is None
+        ):
+            user = result[0]
+            pinned = is_pinned_to_primary(request, user.pk)
+            set_read_target(PRIMARY if pinned else REPLICA)
+        return result
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        try:
+            user = self.user_model.objects.select_related("profile").get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            ) from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
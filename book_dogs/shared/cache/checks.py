@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+# Each worker process has its own copy of these
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """SHARED_CACHE has to be one cache for all workers"""
+    alias = getattr(settings, "SHARED_CACHE", None)
+    if alias not in settings.CACHES:
+        return [
+            Error(
+                f"SHARED_CACHE refers to the undefined cache {alias!r}.",
+                id="shared.cache.E001",
+            )
+        ]
+
+    backend = settings.CACHES[alias]["BACKEND"]
+    if backend in PROCESS_LOCAL_CACHES:
+        return [
+            Error(
+                f"The {alias!r} cache ({backend}) is local to each process, so "
+                "each worker would keep its own copy of state meant to be "
+                "shared.",
+                hint="Point SHARED_CACHE at a shared cache backend (database, "
+                "Redis, Memcached).",
+                id="shared.cache.E002",
+            )
+        ]
+    return []
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache_backend(app_configs, **kwargs):
+    """Throttle counters are written on every request"""
+    alias = getattr(settings, "SHARED_CACHE", None)
+    backend = settings.CACHES.get(alias, {}).get("BACKEND")
+    if backend == "django.core.cache.backends.db.DatabaseCache":
+        return [
+            Warning(
+                f"The {alias!r} cache is stored in the database, so throttling "
+                "adds queries on the primary to every request.",
+                hint="Point SHARED_CACHE at Redis or Memcached in production.",
+                id="shared.cache.W001",
+            )
+        ]
+    return []
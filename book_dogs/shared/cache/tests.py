@@ -0,0 +1,35 @@
+from django.core.checks import Error
+from django.test import SimpleTestCase, override_settings
+
+from .checks import check_shared_cache, check_shared_cache_backend
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(SHARED_CACHE="default")
+    def test_process_local_cache_is_an_error(self):
+        errors = check_shared_cache(None)
+        self.assertEqual([error.id for error in errors], ["shared.cache.E002"])
+        self.assertIsInstance(errors[0], Error)
+
+    @override_settings(SHARED_CACHE="missing")
+    def test_undefined_cache_is_an_error(self):
+        errors = check_shared_cache(None)
+        self.assertEqual([error.id for error in errors], ["shared.cache.E001"])
+
+    def test_database_cache_is_a_deploy_warning(self):
+        warnings = check_shared_cache_backend(None)
+        self.assertEqual([warning.id for warning in warnings], ["shared.cache.W001"])
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "shared": {
+                "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache"
+            },
+        }
+    )
+    def test_memcached_passes_deploy_check(self):
+        self.assertEqual(check_shared_cache_backend(None), [])
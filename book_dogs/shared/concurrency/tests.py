@@ -0,0 +1,90 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from .single_flight import SingleFlight
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def run_leader(self, fn):
+        """Start a call on another thread and wait until it's running"""
+        results = []
+
+        def leader():
+            try:
+                results.append(self.flight.do("key", fn))
+            except Exception as e:
+                results.append(e)
+
+        thread = threading.Thread(target=leader)
+        thread.start()
+        self.started.wait(5)
+        return thread, results
+
+    def test_concurrent_callers_share_one_call(self):
+        calls = []
+
+        def slow():
+            calls.append(1)
+            self.started.set()
+            self.release.wait(5)
+            return "result"
+
+        thread, results = self.run_leader(slow)
+        follower_results = []
+        follower = threading.Thread(
+            target=lambda: follower_results.append(
+                self.flight.do("key", lambda: "other")
+            )
+        )
+        follower.start()
+        # Still waiting on the leader
+        follower.join(0.1)
+        self.assertTrue(follower.is_alive())
+        self.release.set()
+        thread.join(5)
+        follower.join(5)
+
+        self.assertEqual(results, ["result"])
+        self.assertEqual(follower_results, ["result"])
+        self.assertEqual(calls, [1])
+
+    def test_exception_is_shared(self):
+        def failing():
+            self.started.set()
+            self.release.wait(5)
+            raise ValueError("boom")
+
+        thread, results = self.run_leader(failing)
+        follower_errors = []
+
+        def follower():
+            try:
+                self.flight.do("key", lambda: "other")
+            except ValueError as e:
+                follower_errors.append(e)
+
+        follower_thread = threading.Thread(target=follower)
+        follower_thread.start()
+        follower_thread.join(0.1)
+        self.assertTrue(follower_thread.is_alive())
+        self.release.set()
+        thread.join(5)
+        follower_thread.join(5)
+
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(follower_errors, [results[0]])
+
+    def test_nothing_cached_after_the_call(self):
+        self.assertEqual(self.flight.do("key", lambda: 1), 1)
+        self.assertEqual(self.flight.do("key", lambda: 2), 2)
+
+    def test_different_keys_run_separately(self):
+        self.assertEqual(self.flight.do("a", lambda: "a"), "a")
+        self.assertEqual(self.flight.do("b", lambda: "b"), "b")
@@ -0,0 +1,23 @@
+from django.db import connections, router
+
+
+def delete_where_in(model, field_name, values):
+    """Delete the ``model`` rows whose ``field_name`` is in ``values``.
+
+    ``values`` is a single column queryset (``.values("pk")``) and is sent as a
+    subquery, so this is one ``DELETE ... WHERE col IN (SELECT ...)`` however
+    many rows match. Unlike ``QuerySet.delete()`` no rows are loaded and no
+    delete signals or cascades run: only use it on tables nothing references,
+    or after their dependents were deleted. Returns the number of rows deleted.
+    """
+    connection = connections[router.db_for_write(model)]
+    subquery, params = values.query.get_compiler(connection=connection).as_sql()
+    quote_name = connection.ops.quote_name
+    sql = "DELETE FROM %s WHERE %s IN (%s)" % (
+        quote_name(model._meta.db_table),
+        quote_name(model._meta.get_field(field_name).column),
+        subquery,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
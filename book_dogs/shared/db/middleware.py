@@ -0,0 +1,36 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from .routing import (
+    PRIMARY,
+    pin_to_primary,
+    reset_read_target,
+    set_read_target,
+)
+
+
+class ReplicaRoutingMiddleware:
+    """Keep writes and read-your-writes on the primary.
+
+    Unsafe requests read from the primary and, when they succeed, pin the
+    user to it for READ_YOUR_WRITES_WINDOW seconds with a signed cookie.
+    Safe requests are left undecided here; ProfileJWTAuthentication sends
+    them to the replica unless they carry the user's pin. Clients that drop
+    cookies read from the replica right after their writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        unsafe = request.method not in SAFE_METHODS
+        # Always reset afterwards so nothing leaks into the thread's next request
+        token = set_read_target(PRIMARY if unsafe else None)
+        try:
+            response = self.get_response(request)
+            # DRF sets the authenticated user on the underlying request
+            user = getattr(request, "user", None)
+            if unsafe and response.status_code < 400 and user and user.is_authenticated:
+                pin_to_primary(response, user.pk)
+            return response
+        finally:
+            reset_read_target(token)
@@ -0,0 +1,31 @@
+from django.db import DEFAULT_DB_ALIAS
+
+from .routing import REPLICA, get_read_target, get_replica_alias
+
+
+class PrimaryReplicaRouter:
+    """Writes go to the primary, reads to the replica only when asked to.
+
+    The read target is set per request by ReplicaRoutingMiddleware and the
+    JWT authentication, or around service calls with use_replica().
+    """
+
+    def db_for_read(self, model, **hints):
+        # The shared database cache only lives on the primary
+        if model._meta.app_label == "django_cache":
+            return DEFAULT_DB_ALIAS
+        if get_read_target() == REPLICA:
+            return get_replica_alias() or DEFAULT_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both sides
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == get_replica_alias():
+            return False
+        return None
@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PRIMARY = "primary"
+REPLICA = "replica"
+PIN_COOKIE = "db_primary_pin"
+
+# Where reads of the current request/task go. None means undecided, which
+# reads from the primary except inside use_replica().
+_read_target = ContextVar("db_read_target", default=None)
+
+
+def get_read_target():
+    return _read_target.get()
+
+
+def set_read_target(target):
+    """Set the read target, returns a token for reset_read_target"""
+    return _read_target.set(target)
+
+
+def reset_read_target(token):
+    _read_target.reset(token)
+
+
+def get_replica_alias():
+    """The configured replica alias, None when there is no replica"""
+    alias = getattr(settings, "DATABASE_REPLICA_ALIAS", None)
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def use_replica():
+    """Read from the replica unless pinned to the primary.
+
+    Inside a transaction on the primary the reads stay there, so a service
+    called while writing still sees its own changes.
+    """
+    if get_read_target() == PRIMARY or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        yield
+        return
+
+    token = set_read_target(REPLICA)
+    try:
+        yield
+    finally:
+        reset_read_target(token)
+
+
+def replica_read(func):
+    """Run a read-only service call with use_replica()"""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with use_replica():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def pin_to_primary(response, user_id):
+    """Keep the user's reads on the primary until the replica caught up.
+
+    The pin travels with the client as a short-lived signed cookie, so the
+    worker serving the next request sees it without a lookup.
+    """
+    response.set_signed_cookie(
+        PIN_COOKIE,
+        str(user_id),
+        salt=PIN_COOKIE,
+        max_age=settings.READ_YOUR_WRITES_WINDOW,
+        httponly=True,
+        samesite="Lax",
+    )
+
+
+def is_pinned_to_primary(request, user_id):
+    # The signature's timestamp bounds the pin, whatever the client does with
+    # the cookie
+    pinned_user_id = request.get_signed_cookie(
+        PIN_COOKIE,
+        default=None,
+        salt=PIN_COOKIE,
+        max_age=settings.READ_YOUR_WRITES_WINDOW,
+    )
+    return pinned_user_id == str(user_id)
@@ -0,0 +1,136 @@
+import time
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, router
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from book_sessions.models import BookSession
+from users.models import User
+from .routing import PIN_COOKIE, use_replica
+
+
+class ReplicaRoutingTests(TestCase):
+    databases = {"default", "replica"}
+
+    @classmethod
+    def setUpClass(cls):
+        # Real replicas get their schema through replication, not migrate
+        replica = connections["replica"]
+        existing_tables = replica.introspection.table_names()
+        with replica.schema_editor() as editor:
+            for model in apps.get_models():
+                if model._meta.db_table not in existing_tables:
+                    editor.create_model(model)
+        super().setUpClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="reader", email="reader@example.com"
+        )
+        BookSession.objects.create(
+            owner=self.user,
+            title="On the primary",
+            page_number=100,
+            author="a",
+            genre="g",
+        )
+        # The replica hasn't seen the latest write yet
+        User.objects.using("replica").create(
+            pk=self.user.pk, username="reader", email="reader@example.com"
+        )
+        BookSession.objects.using("replica").create(
+            owner_id=self.user.pk,
+            title="On the replica",
+            page_number=100,
+            author="a",
+            genre="g",
+        )
+
+        self.client = APIClient()
+        self.authenticate(self.user)
+
+    def authenticate(self, user):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+
+    def create_book(self):
+        return self.client.post(
+            "/api/book-sessions/",
+            {
+                "title": "New",
+                "description": "d",
+                "page_number": 10,
+                "author": "a",
+                "genre": "g",
+            },
+        )
+
+    def list_titles(self):
+        response = self.client.get("/api/book-sessions/")
+        self.assertEqual(response.status_code, 200)
+        return [book["title"] for book in response.json()]
+
+    def test_safe_requests_read_from_replica(self):
+        self.assertEqual(self.list_titles(), ["On the replica"])
+
+    def test_writes_pin_the_user_to_the_primary(self):
+        response = self.create_book()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(self.list_titles(), ["On the primary", "New"])
+
+    def test_failed_writes_dont_pin(self):
+        response = self.client.post("/api/book-sessions/", {})
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_pin_expires(self):
+        self.assertEqual(self.create_book().status_code, 201)
+
+        later = time.time() + settings.READ_YOUR_WRITES_WINDOW + 1
+        with mock.patch("django.core.signing.time.time", return_value=later):
+            self.assertEqual(self.list_titles(), ["On the replica"])
+
+    def test_pin_only_applies_to_its_user(self):
+        self.assertEqual(self.create_book().status_code, 201)
+        other_user = User.objects.create_user(
+            username="other", email="other@example.com"
+        )
+        BookSession.objects.create(
+            owner=other_user, title="Not replicated yet", page_number=1
+        )
+
+        self.authenticate(other_user)
+        self.assertEqual(self.list_titles(), [])
+
+    def test_tampered_pin_is_ignored(self):
+        self.client.cookies[PIN_COOKIE] = str(self.user.pk)
+        self.assertEqual(self.list_titles(), ["On the replica"])
+
+    @override_settings(DATABASE_REPLICA_ALIAS=None)
+    def test_everything_on_primary_without_replica(self):
+        self.assertEqual(self.list_titles(), ["On the primary"])
+
+    def test_use_replica_stays_on_primary_in_transaction(self):
+        # TestCase runs every test in a transaction on the primary
+        with use_replica():
+            self.assertEqual(router.db_for_read(BookSession), "default")
+
+    # Throttle counters are in Redis/Memcached in production, not a query
+    @override_settings(SHARED_CACHE="default")
+    def test_me_queries(self):
+        # The user is authenticated on the primary, everything else is read
+        # from the replica; the pin check costs no query
+        with (
+            self.assertNumQueries(1),
+            self.assertNumQueries(1, using="replica"),
+        ):
+            response = self.client.get("/api/users/me/")
+
+        self.assertEqual(response.status_code, 200)
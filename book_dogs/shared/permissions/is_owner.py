@@ -4,4 +4,6 @@ from rest_framework.permissions import BasePermission
 # Plugging customized permission
 class IsOwner(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.user == request.user
+        # Profiles point to their user, book sessions to their owner
+        owner = obj.owner if hasattr(obj, "owner") else obj.user
+        return owner == request.user
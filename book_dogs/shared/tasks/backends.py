@@ -0,0 +1,86 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    """Raised when a backend refuses new work because its queue is full"""
+
+
+class BaseTaskBackend:
+    """Interface for task backends.
+
+    A broker-backed backend (Celery, RQ, SQS...) only has to implement
+    ``submit`` and hand ``run`` to its worker; ``run`` takes care of retries,
+    idempotency bookkeeping and metrics.
+    """
+
+    def __init__(self, run, **options):
+        self.run = run
+        self.options = options
+
+    def submit(self, task, args, kwargs, idempotency_key=None):
+        raise NotImplementedError
+
+    def queue_depth(self):
+        return 0
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class ImmediateTaskBackend(BaseTaskBackend):
+    """Run tasks inline, right after the transaction commits"""
+
+    def submit(self, task, args, kwargs, idempotency_key=None):
+        self.run(task, args, kwargs, idempotency_key)
+
+
+class ThreadPoolTaskBackend(BaseTaskBackend):
+    """Run tasks on a bounded in-process thread pool"""
+
+    def __init__(self, run, max_workers=4, max_queue_size=1000, **options):
+        super().__init__(run, **options)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tasks"
+        )
+        # Running + waiting tasks can never exceed this, so a burst of
+        # session endings can't grow memory without bound.
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue_size)
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def submit(self, task, args, kwargs, idempotency_key=None):
+        if not self._slots.acquire(blocking=False):
+            raise QueueFull(f"Task queue is full, dropping {task.name}")
+
+        with self._lock:
+            self._pending += 1
+
+        try:
+            self._executor.submit(self._work, task, args, kwargs, idempotency_key)
+        except RuntimeError:
+            # Executor is shutting down
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+            raise
+
+    def _work(self, task, args, kwargs, idempotency_key):
+        with self._lock:
+            self._pending -= 1
+        try:
+            self.run(task, args, kwargs, idempotency_key)
+        except Exception:
+            logger.exception("Unhandled error in task %s", task.name)
+        finally:
+            self._slots.release()
+
+    def queue_depth(self):
+        with self._lock:
+            return self._pending
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,171 @@
+import logging
+import threading
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.db import close_old_connections, transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .backends import QueueFull
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASKS = {
+    "BACKEND": "shared.tasks.backends.ThreadPoolTaskBackend",
+    "OPTIONS": {},
+    "IDEMPOTENCY_TIMEOUT": 60 * 60 * 24,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+class TaskMetrics:
+    """Process-wide task counters"""
+
+    COUNTERS = ("enqueued", "succeeded", "failed", "retried", "rejected", "skipped")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.COUNTERS, 0)
+
+    def incr(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+
+metrics = TaskMetrics()
+
+
+class Task:
+    def __init__(self, func, name, max_retries, retry_backoff):
+        self.func = func
+        self.name = name
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, idempotency_key=None, **kwargs):
+        """Run the task once the current transaction commits"""
+        enqueue(self, args, kwargs, idempotency_key=idempotency_key)
+
+
+def task(func=None, *, name=None, max_retries=3, retry_backoff=0.5):
+    """Turn a function into a background task"""
+
+    def decorator(func):
+        return Task(
+            func,
+            name=name or f"{func.__module__}.{func.__qualname__}",
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+        )
+
+    return decorator(func) if func is not None else decorator
+
+
+def _get_config():
+    return {**DEFAULT_TASKS, **getattr(settings, "TASKS", {})}
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                config = _get_config()
+                backend_class = import_string(config["BACKEND"])
+                _backend = backend_class(run, **config["OPTIONS"])
+    return _backend
+
+
+@receiver(setting_changed)
+def _reset_backend(setting, **kwargs):
+    """Rebuild the backend when TASKS changes (override_settings)"""
+    global _backend
+    if setting == "TASKS" and _backend is not None:
+        with _backend_lock:
+            _backend.shutdown(wait=False)
+            _backend = None
+
+
+def get_metrics():
+    return {**metrics.snapshot(), "queue_depth": get_backend().queue_depth()}
+
+
+def _idempotency_cache_key(key):
+    return f"tasks:done:{key}"
+
+
+def enqueue(task, args=(), kwargs=None, idempotency_key=None, using=None):
+    """Schedule ``task`` for after the surrounding transaction commits.
+
+    Nothing is queued if the transaction rolls back. Tasks sharing an
+    ``idempotency_key`` run at most once while the key is remembered.
+    """
+    transaction.on_commit(
+        partial(_dispatch, task, tuple(args), kwargs or {}, idempotency_key),
+        using=using,
+    )
+
+
+def _dispatch(task, args, kwargs, idempotency_key):
+    if idempotency_key is not None:
+        claimed = cache.add(
+            _idempotency_cache_key(idempotency_key),
+            True,
+            _get_config()["IDEMPOTENCY_TIMEOUT"],
+        )
+        if not claimed:
+            metrics.incr("skipped")
+            return
+
+    try:
+        get_backend().submit(task, args, kwargs, idempotency_key)
+    except (QueueFull, RuntimeError):
+        metrics.incr("rejected")
+        logger.warning("Task %s rejected by backend", task.name, exc_info=True)
+        _forget(idempotency_key)
+    else:
+        metrics.incr("enqueued")
+
+
+def _forget(idempotency_key):
+    if idempotency_key is not None:
+        cache.delete(_idempotency_cache_key(idempotency_key))
+
+
+def run(task, args, kwargs, idempotency_key=None):
+    """Execute a task with retries; called by backends on their worker"""
+    attempt = 0
+    while True:
+        close_old_connections()
+        try:
+            task.func(*args, **kwargs)
+        except Exception:
+            if attempt >= task.max_retries:
+                metrics.incr("failed")
+                logger.exception(
+                    "Task %s failed after %d attempts", task.name, attempt + 1
+                )
+                # Let a later enqueue with the same key try again
+                _forget(idempotency_key)
+                return
+            metrics.incr("retried")
+            time.sleep(task.retry_backoff * (2**attempt))
+            attempt += 1
+        else:
+            metrics.incr("succeeded")
+            return
+        finally:
+            close_old_connections()
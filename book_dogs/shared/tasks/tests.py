@@ -0,0 +1,161 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from . import queue
+from .backends import QueueFull, ThreadPoolTaskBackend
+from .queue import get_metrics, task
+
+IMMEDIATE = {"BACKEND": "shared.tasks.backends.ImmediateTaskBackend", "OPTIONS": {}}
+
+
+def blocking_pool(max_queue_size):
+    """TASKS for a single worker pool, easy to fill up"""
+    return {
+        "BACKEND": "shared.tasks.backends.ThreadPoolTaskBackend",
+        "OPTIONS": {"max_workers": 1, "max_queue_size": max_queue_size},
+    }
+
+
+class MetricsDelta:
+    def __enter__(self):
+        self.before = queue.metrics.snapshot()
+        return self
+
+    def __exit__(self, *exc_info):
+        after = queue.metrics.snapshot()
+        self.delta = {name: after[name] - self.before[name] for name in after}
+
+
+@override_settings(TASKS=IMMEDIATE)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = []
+
+        @task(max_retries=3, retry_backoff=0.5)
+        def record(value):
+            self.calls.append(value)
+
+        self.record = record
+
+    def test_runs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.record.delay(1)
+            self.assertEqual(self.calls, [])
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.calls, [1])
+
+    def test_nothing_runs_on_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self.record.delay(1)
+                raise RuntimeError("roll back")
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.calls, [])
+
+    @mock.patch("shared.tasks.queue.time.sleep")
+    def test_retries_with_exponential_backoff(self, sleep):
+        attempts = []
+
+        @task(max_retries=3, retry_backoff=0.5)
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RuntimeError("try again")
+
+        with MetricsDelta() as metrics, self.captureOnCommitCallbacks(execute=True):
+            flaky.delay()
+
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(sleep.call_args_list, [mock.call(0.5), mock.call(1.0)])
+        self.assertEqual(metrics.delta["retried"], 2)
+        self.assertEqual(metrics.delta["succeeded"], 1)
+
+    @mock.patch("shared.tasks.queue.time.sleep")
+    def test_gives_up_after_max_retries_and_forgets_key(self, sleep):
+        @task(max_retries=2, retry_backoff=0.5)
+        def broken():
+            raise RuntimeError("always")
+
+        with (
+            self.assertLogs("shared.tasks.queue", "ERROR"),
+            MetricsDelta() as metrics,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            broken.delay(idempotency_key="broken")
+
+        self.assertEqual(sleep.call_args_list, [mock.call(0.5), mock.call(1.0)])
+        self.assertEqual(metrics.delta["failed"], 1)
+        # A failed run doesn't block a later attempt with the same key
+        self.assertIsNone(cache.get("tasks:done:broken"))
+
+    def test_idempotency_key_runs_once(self):
+        with MetricsDelta() as metrics, self.captureOnCommitCallbacks(execute=True):
+            self.record.delay(1, idempotency_key="once")
+            self.record.delay(2, idempotency_key="once")
+            self.record.delay(3)
+
+        self.assertEqual(self.calls, [1, 3])
+        self.assertEqual(metrics.delta["skipped"], 1)
+        self.assertEqual(metrics.delta["succeeded"], 2)
+
+
+class ThreadPoolBackendTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+        @task
+        def block():
+            self.started.set()
+            self.release.wait(5)
+
+        self.block = block
+        self.addCleanup(self.release.set)
+
+    def test_full_queue_raises(self):
+        backend = ThreadPoolTaskBackend(queue.run, max_workers=1, max_queue_size=1)
+        self.addCleanup(backend.shutdown)
+        self.addCleanup(self.release.set)
+
+        backend.submit(self.block, (), {})
+        self.started.wait(5)
+        backend.submit(self.block, (), {})
+        with self.assertRaises(QueueFull):
+            backend.submit(self.block, (), {})
+
+    @override_settings(TASKS=blocking_pool(max_queue_size=0))
+    def test_rejected_task_is_counted_and_its_key_forgotten(self):
+        with (
+            self.assertLogs("shared.tasks.queue", "WARNING"),
+            MetricsDelta() as metrics,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.block.delay()
+            self.block.delay(idempotency_key="rejected")
+
+        self.assertEqual(metrics.delta["enqueued"], 1)
+        self.assertEqual(metrics.delta["rejected"], 1)
+        # Not claimed, so it can be enqueued again once there's room
+        self.assertIsNone(cache.get("tasks:done:rejected"))
+
+    @override_settings(TASKS=blocking_pool(max_queue_size=10))
+    def test_metrics_report_queue_depth(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.block.delay()
+        self.started.wait(5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                self.block.delay()
+
+        self.assertEqual(get_metrics()["queue_depth"], 3)
+        self.release.set()
+        queue.get_backend().shutdown(wait=True)
+        self.assertEqual(get_metrics()["queue_depth"], 0)
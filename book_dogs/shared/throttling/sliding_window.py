@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """Sliding-window counter throttle.
+
+    DRF's default throttles keep a list of request timestamps per client and
+    rewrite it on every call. Here each client only has two integer counters
+    (current and previous fixed window); the previous window is weighted by
+    how much of it still overlaps the sliding window.
+
+    The counters live in SHARED_CACHE so every worker counts against the
+    same limit. A request is counted before it is checked, so concurrent
+    requests can't all slip under the limit (atomic with Redis/Memcached).
+    """
+
+    @property
+    def cache(self):
+        return caches[settings.SHARED_CACHE]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.elapsed = self.now - window * self.duration
+        current_key = f"{self.key}:{window}"
+
+        # Count this request first; current is what came before it
+        self.current = self.increment(current_key) - 1
+        self.previous = self.cache.get(f"{self.key}:{window - 1}", 0)
+
+        if self.estimate() >= self.num_requests:
+            # Rejected requests don't count against the client
+            try:
+                self.cache.decr(current_key)
+            except ValueError:
+                pass
+            return self.throttle_failure()
+        return True
+
+    def increment(self, key):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # First request of the window. Keep the counter around for its
+            # own window and the next one, where it becomes the weighted
+            # previous window.
+            if self.cache.add(key, 1, self.duration * 2):
+                return 1
+            # Another request created it in the meantime
+            return self.cache.incr(key)
+
+    def estimate(self):
+        overlap = 1 - self.elapsed / self.duration
+        return self.previous * overlap + self.current
+
+    def wait(self):
+        remaining = self.duration - self.elapsed
+        if self.current >= self.num_requests or not self.previous:
+            return remaining
+
+        # Time until enough of the previous window slides out
+        excess = self.estimate() - self.num_requests + 1
+        return min(remaining, excess / self.previous * self.duration)
+
+
+class AnonSlidingWindowThrottle(AnonRateThrottle, SlidingWindowRateThrottle):
+    """Per-IP limit for anonymous clients (``anon`` scope)"""
+
+
+class UserSlidingWindowThrottle(UserRateThrottle, SlidingWindowRateThrottle):
+    """Per-user limit, per-IP for anonymous clients (``user`` scope)"""
+
+
+class ScopedSlidingWindowThrottle(ScopedRateThrottle, SlidingWindowRateThrottle):
+    """Per-user/IP limit for views that set ``throttle_scope``"""
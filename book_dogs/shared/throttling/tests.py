@@ -0,0 +1,89 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.test import TestCase
+
+from .sliding_window import SlidingWindowRateThrottle
+
+# Start of a fixed window, so offsets below read as seconds into it
+WINDOW_START = 60 * 1000
+CURRENT_KEY = "throttle_test:1000"
+
+
+class ThreePerMinute(SlidingWindowRateThrottle):
+    rate = "3/min"
+
+    def get_cache_key(self, request, view):
+        return "throttle_test"
+
+
+class SlidingWindowRateThrottleTests(TestCase):
+    def setUp(self):
+        self.shared_cache = caches[settings.SHARED_CACHE]
+        self.shared_cache.clear()
+
+    def request_at(self, offset):
+        throttle = ThreePerMinute()
+        throttle.timer = lambda: WINDOW_START + offset
+        return throttle, throttle.allow_request(None, None)
+
+    def test_limit_within_one_window(self):
+        allowed = [self.request_at(offset)[1] for offset in (0, 10, 20, 30)]
+        self.assertEqual(allowed, [True, True, True, False])
+
+    def test_previous_window_weighs_by_overlap(self):
+        for offset in (0, 10, 20):
+            self.request_at(offset)
+
+        # Halfway into the next window the previous one counts for 1.5
+        allowed = [self.request_at(offset)[1] for offset in (90, 91, 92)]
+        self.assertEqual(allowed, [True, True, False])
+
+    def test_wait_until_enough_of_previous_window_slid_out(self):
+        for offset in (0, 10, 20, 90, 91):
+            self.request_at(offset)
+
+        throttle, allowed = self.request_at(90)
+        self.assertFalse(allowed)
+        # Estimate 3.5: it takes a third of the window to shed 1.5 requests
+        self.assertAlmostEqual(throttle.wait(), 30)
+
+    def test_old_windows_are_forgotten(self):
+        for offset in (0, 10, 20):
+            self.request_at(offset)
+
+        allowed = [self.request_at(offset)[1] for offset in (120, 121, 122)]
+        self.assertEqual(allowed, [True, True, True])
+
+    def test_counters_are_shared_by_all_workers(self):
+        self.request_at(0)
+
+        self.assertEqual(self.shared_cache.get(CURRENT_KEY), 1)
+        self.assertIsNone(cache.get(CURRENT_KEY))
+
+    def test_rejected_requests_dont_count(self):
+        for offset in (0, 10, 20, 30, 40):
+            self.request_at(offset)
+
+        self.assertEqual(self.shared_cache.get(CURRENT_KEY), 3)
+
+    def test_counts_requests_of_other_workers_in_between(self):
+        # Two workers already counted their request, neither checked yet
+        self.shared_cache.set(CURRENT_KEY, 2)
+
+        allowed = [self.request_at(offset)[1] for offset in (0, 1)]
+        self.assertEqual(allowed, [True, False])
+
+    def test_lost_race_to_create_the_counter(self):
+        def add_by_another_request(key, value, timeout):
+            self.shared_cache.set(key, value, timeout)
+            return False
+
+        with mock.patch.object(
+            self.shared_cache, "add", side_effect=add_by_another_request
+        ):
+            throttle, allowed = self.request_at(0)
+
+        self.assertTrue(allowed)
+        self.assertEqual(self.shared_cache.get(CURRENT_KEY), 2)
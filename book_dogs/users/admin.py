@@ -1,3 +1,75 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
+from django.db.models import Count, IntegerField, OuterRef, Subquery
 
-# Register your models here.
+from book_sessions.models import BookSession
+from shared.admin.options import ServiceDeleteMixin
+from shared.admin.paginators import EstimatedCountPaginator
+from .forms import UserCreationForm, UserUpdateForm
+from .models import User, Profile
+from .services import UserService
+
+
+@admin.register(User)
+class UserAdmin(ServiceDeleteMixin, DjangoUserAdmin):
+    form = UserUpdateForm
+    add_form = UserCreationForm
+    add_fieldsets = (
+        (
+            None,
+            {
+                "classes": ("wide",),
+                "fields": (
+                    "email",
+                    "username",
+                    "usable_password",
+                    "password1",
+                    "password2",
+                ),
+            },
+        ),
+    )
+    list_display = ("email", "username", "is_staff", "books_count", "date_joined")
+    # Django's is_staff/is_superuser/is_active filters are left out: none of
+    # them is indexed, so each would scan the table
+    list_filter = ()
+    # Exact matches only, a substring search scans the whole table
+    search_fields = ("=email", "=username")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # Per-row subquery: only runs for the rows on the page
+        books_count = (
+            BookSession.objects.filter(owner=OuterRef("pk"))
+            .order_by()
+            .values("owner")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(_books_count=Subquery(books_count, output_field=IntegerField()))
+        )
+
+    @admin.display(description="Books")
+    def books_count(self, obj):
+        return obj._books_count or 0
+
+    def delete_model(self, request, obj):
+        UserService.delete_account(obj)
+
+    def delete_queryset(self, request, queryset):
+        UserService.delete_accounts(queryset)
+
+
+@admin.register(Profile)
+class ProfileAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "city", "created_at")
+    list_select_related = ("user",)
+    autocomplete_fields = ("user",)
+    search_fields = ("=user__email",)
+    readonly_fields = ("created_at", "updated_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,14 @@
+from django.contrib.auth.forms import AdminUserCreationForm, UserChangeForm
+from .models import User
+
+
+# Django's user forms are bound to auth.User; point them at ours
+class UserCreationForm(AdminUserCreationForm):
+    class Meta(AdminUserCreationForm.Meta):
+        model = User
+        fields = ("email", "username")
+
+
+class UserUpdateForm(UserChangeForm):
+    class Meta(UserChangeForm.Meta):
+        model = User
@@ -15,7 +15,7 @@ class User(AbstractUser):
     @property
     def finished_books(self):
         """Get finished book sessions for this user"""
-        return self.book_sessions.filter(status="finished").count()
+        return self.book_sessions.filter(is_finished=True).count()
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -32,3 +32,6 @@ class Profile(models.Model):
     website = models.URLField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Profile of user {self.user_id}"
@@ -20,6 +20,16 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return user
 
 
+class DeleteAccountSerializer(serializers.Serializer):
+    # Deleting the account can't be undone, so ask for the password again
+    password = serializers.CharField(write_only=True, required=True)
+
+    def validate_password(self, value):
+        if not self.context["request"].user.check_password(value):
+            raise serializers.ValidationError("Incorrect password")
+        return value
+
+
 class UserSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -38,3 +48,28 @@ class ProfileSerializer(serializers.ModelSerializer):
             "profile_picture": {"required": False},
             "website": {"required": False},
         }
+
+
+class MeSerializer(serializers.ModelSerializer):
+    profile = serializers.SerializerMethodField()
+    reading_summary = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ["id", "username", "email", "profile", "reading_summary"]
+
+    def get_profile(self, obj):
+        """Profile is select_related, so a missing one costs no query"""
+        profile = getattr(obj, "profile", None)
+        return (
+            ProfileSerializer(profile, context=self.context).data if profile else None
+        )
+
+    def get_reading_summary(self, obj):
+        """Read from the UserService.with_reading_summary annotations"""
+        return {
+            "books": obj.books_count,
+            "finished_books": obj.finished_books_count,
+            "pages_read": obj.pages_read or 0,
+            "active_sessions": obj.active_sessions_count,
+        }
@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from book_sessions.models import BookSession, ReadingSessionArchiveSummary
+from book_sessions.services import BookSessionService
+
+
+class UserService:
+    @staticmethod
+    def delete_account(user):
+        with transaction.atomic():
+            # Bulk path for the reading history instead of the ORM cascade
+            BookSessionService.delete_book_sessions(user.book_sessions.all())
+            user.delete()
+
+    @staticmethod
+    def delete_accounts(users):
+        """delete_account for a queryset of users, e.g. an admin selection"""
+        with transaction.atomic():
+            BookSessionService.delete_book_sessions(
+                BookSession.objects.filter(owner__in=users.values("pk"))
+            )
+            return users.delete()
+
+    @staticmethod
+    def with_reading_summary(users):
+        """Annotate users with their reading summary, profile joined in"""
+        # Subquery so the summaries aren't multiplied by the sessions join
+        archived_pages_read = (
+            ReadingSessionArchiveSummary.objects.filter(
+                book_session__owner=OuterRef("pk")
+            )
+            .order_by()
+            .values("book_session__owner")
+            .annotate(total=Sum("pages_read"))
+            .values("total")
+        )
+        return users.select_related("profile").annotate(
+            books_count=Count("book_sessions", distinct=True),
+            finished_books_count=Count(
+                "book_sessions",
+                filter=Q(book_sessions__is_finished=True),
+                distinct=True,
+            ),
+            pages_read=Coalesce(Sum("book_sessions__reading_sessions__pages_read"), 0)
+            + Coalesce(Subquery(archived_pages_read), 0),
+            active_sessions_count=Count(
+                "book_sessions__reading_sessions",
+                filter=Q(book_sessions__reading_sessions__end_time__isnull=True),
+            ),
+        )
@@ -1,3 +1,292 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from book_sessions.models import (
+    BookSession,
+    ReadingSession,
+    ReadingSessionArchiveSummary,
+)
+from shared.authentication.jwt import ProfileJWTAuthentication
+from shared.throttling.sliding_window import SlidingWindowRateThrottle
+from .models import Profile, User
+from .services import UserService
+
+FAST_HASHER = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHER)
+class TokenThrottleTests(TestCase):
+    def setUp(self):
+        caches[settings.SHARED_CACHE].clear()
+        # Same point in time for every request, so no window boundary is
+        # crossed halfway through
+        frozen = mock.patch.object(
+            SlidingWindowRateThrottle, "timer", lambda self: 60 * 1000 + 30
+        )
+        frozen.start()
+        self.addCleanup(frozen.stop)
+        self.client = APIClient()
+        User.objects.create_user(
+            username="reader", email="reader@example.com", password="pw"
+        )
+
+    def obtain_token(self, password="pw"):
+        return self.client.post(
+            "/api/token", {"email": "reader@example.com", "password": password}
+        )
+
+    def test_token_endpoint_is_limited_per_ip(self):
+        statuses = [self.obtain_token("wrong").status_code for _ in range(10)]
+        self.assertEqual(set(statuses), {401})
+
+        response = self.obtain_token()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    def test_limit_is_scoped_to_the_token_endpoint(self):
+        for _ in range(11):
+            self.obtain_token("wrong")
+
+        response = self.client.post(
+            "/api/users/register/",
+            {"username": "new", "email": "new@example.com", "password": "pw"},
+        )
+        self.assertEqual(response.status_code, 201)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHER)
+class DeleteAccountTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="reader", email="reader@example.com", password="pw"
+        )
+        Profile.objects.create(user=self.user)
+        book = BookSession.objects.create(
+            owner=self.user,
+            title="Dune",
+            description="d",
+            page_number=100,
+            author="a",
+            genre="g",
+        )
+        ReadingSession.objects.create(book_session=book, pages_read=10)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def delete_account(self, data):
+        return self.client.delete("/api/users/account/delete/", data)
+
+    def test_requires_password(self):
+        self.assertEqual(self.delete_account({}).status_code, 400)
+        self.assertEqual(self.delete_account({"password": "wrong"}).status_code, 400)
+        self.assertTrue(User.objects.filter(pk=self.user.pk).exists())
+        self.assertTrue(BookSession.objects.filter(owner=self.user).exists())
+
+    def test_deletes_account_and_reading_history(self):
+        response = self.delete_account({"password": "pw"})
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Profile.objects.exists())
+        self.assertFalse(BookSession.objects.exists())
+        self.assertFalse(ReadingSession.objects.exists())
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.delete_account({"password": "pw"}).status_code, 401)
+
+
+def create_book(owner, **data):
+    data = {
+        "title": "Dune",
+        "description": "d",
+        "page_number": 100,
+        "author": "a",
+        "genre": "g",
+        **data,
+    }
+    return BookSession.objects.create(owner=owner, **data)
+
+
+# Throttle counters are in Redis/Memcached in production, not a query
+@override_settings(DATABASE_REPLICA_ALIAS=None, SHARED_CACHE="default")
+class MeViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="reader", email="reader@example.com", password="pw"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_reading_summary(self):
+        Profile.objects.create(user=self.user, city="Lisbon")
+        finished = create_book(self.user, is_finished=True)
+        reading = create_book(self.user)
+        now = timezone.now()
+        for book, pages_read in ((finished, 60), (reading, 15), (reading, 5)):
+            ReadingSession.objects.create(
+                book_session=book, pages_read=pages_read, end_time=now
+            )
+        ReadingSession.objects.create(book_session=reading)  # active
+        ReadingSessionArchiveSummary.objects.create(
+            book_session=finished, sessions_count=2, pages_read=40
+        )
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/users/me/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["profile"]["city"], "Lisbon")
+        self.assertEqual(
+            response.data["reading_summary"],
+            {
+                "books": 2,
+                "finished_books": 1,
+                "pages_read": 120,
+                "active_sessions": 1,
+            },
+        )
+
+    def test_without_profile_or_books(self):
+        response = self.client.get("/api/users/me/")
+
+        self.assertIsNone(response.data["profile"])
+        self.assertEqual(
+            response.data["reading_summary"],
+            {"books": 0, "finished_books": 0, "pages_read": 0, "active_sessions": 0},
+        )
+
+    def test_authentication_loads_profile_in_same_query(self):
+        Profile.objects.create(user=self.user, city="Lisbon")
+        token = AccessToken.for_user(self.user)
+        authentication = ProfileJWTAuthentication()
+
+        with self.assertNumQueries(1):
+            user = authentication.get_user(
+                authentication.get_validated_token(str(token))
+            )
+            self.assertEqual(user.profile.city, "Lisbon")
+
+    def test_finished_books(self):
+        create_book(self.user, is_finished=True)
+        create_book(self.user)
+        self.assertEqual(self.user.finished_books, 1)
+
+
+# Throttle counters are in Redis/Memcached in production, not a query
+@override_settings(DATABASE_REPLICA_ALIAS=None, SHARED_CACHE="default")
+class ProfileBatchLookupTests(TestCase):
+    def setUp(self):
+        self.profiles = [
+            Profile.objects.create(
+                user=User.objects.create_user(
+                    username=f"reader{i}", email=f"reader{i}@example.com"
+                )
+            )
+            for i in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.profiles[0].user)
+
+    def get_profiles(self, ids):
+        return self.client.get("/api/users/profile/", {"ids": ids})
+
+    def test_returns_requested_profiles(self):
+        ids = f"{self.profiles[0].pk},{self.profiles[2].pk},999"
+        with self.assertNumQueries(1):
+            response = self.get_profiles(ids)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(profile["id"] for profile in response.data),
+            [self.profiles[0].pk, self.profiles[2].pk],
+        )
+
+    def test_invalid_ids(self):
+        for ids in ("", "1,a", ",".join(str(pk) for pk in range(1, 102))):
+            with self.subTest(ids=ids[:10]):
+                response = self.get_profiles(ids)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("ids", response.data)
+
+
+@override_settings(DATABASE_REPLICA_ALIAS=None)
+class UserAdminTests(TestCase):
+    changelist_url = "/admin/users/user/"
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username="admin", email="admin@example.com"
+        )
+        self.client.force_login(self.admin_user)
+        self.readers = [
+            User.objects.create_user(username=name, email=f"{name}@example.com")
+            for name in ("ann", "bob")
+        ]
+        for reader in self.readers:
+            book = create_book(reader)
+            ReadingSession.objects.create(book_session=book, pages_read=10)
+
+    def test_changelists_load(self):
+        for url in (
+            self.changelist_url,
+            f"{self.changelist_url}?q=ann",
+            "/admin/users/profile/",
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_search_matches_whole_username_only(self):
+        response = self.client.get(f"{self.changelist_url}?q=an")
+        self.assertEqual(response.context["cl"].result_count, 0)
+
+        response = self.client.get(f"{self.changelist_url}?q=ann")
+        self.assertEqual(list(response.context["cl"].result_list), [self.readers[0]])
+
+    def test_delete_confirmation_lists_only_the_user(self):
+        response = self.client.get(f"{self.changelist_url}{self.readers[0].pk}/delete/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["deleted_objects"], ["User: ann@example.com"])
+
+    def test_delete_view_uses_the_service(self):
+        with mock.patch.object(
+            UserService, "delete_account", wraps=UserService.delete_account
+        ) as delete_account:
+            response = self.client.post(
+                f"{self.changelist_url}{self.readers[0].pk}/delete/", {"post": "yes"}
+            )
+
+        self.assertEqual(response.status_code, 302)
+        delete_account.assert_called_once()
+        self.assertFalse(User.objects.filter(pk=self.readers[0].pk).exists())
+        self.assertEqual(
+            list(BookSession.objects.values_list("owner", flat=True)),
+            [self.readers[1].pk],
+        )
+
+    def test_delete_action_uses_the_service(self):
+        with mock.patch.object(
+            UserService, "delete_accounts", wraps=UserService.delete_accounts
+        ) as delete_accounts:
+            response = self.client.post(
+                self.changelist_url,
+                {
+                    "action": "delete_selected",
+                    "_selected_action": [reader.pk for reader in self.readers],
+                    "post": "yes",
+                },
+            )
+
+        self.assertEqual(response.status_code, 302)
+        delete_accounts.assert_called_once()
+        self.assertEqual(list(User.objects.all()), [self.admin_user])
+        self.assertFalse(BookSession.objects.exists())
+        self.assertFalse(ReadingSession.objects.exists())
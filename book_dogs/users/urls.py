@@ -1,15 +1,18 @@
 from django.urls import path
 from .views import (
     UserRegisterView,
-    CreateProfileView,
+    MeView,
+    ProfileListCreateView,
     ProfileDetailView,
     UpdateProfileView,
     DeleteProfileView,
+    DeleteAccountView,
 )
 
 urlpatterns = [
     path("register/", UserRegisterView.as_view(), name="register"),
-    path("profile/", CreateProfileView.as_view(), name="profile"),
+    path("me/", MeView.as_view(), name="me"),
+    path("profile/", ProfileListCreateView.as_view(), name="profile"),
     path("profile/<int:pk>/", ProfileDetailView.as_view(), name="profile-detail"),
     path(
         "profile/<int:pk>/update/", UpdateProfileView.as_view(), name="profile-update"
@@ -17,4 +20,5 @@ urlpatterns = [
     path(
         "profile/<int:pk>/delete/", DeleteProfileView.as_view(), name="profile-delete"
     ),
+    path("account/delete/", DeleteAccountView.as_view(), name="account-delete"),
 ]
@@ -2,10 +2,17 @@ from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework import generics
 from rest_framework.generics import RetrieveAPIView
-from .serializers import UserRegistrationSerializer, ProfileSerializer
+from .serializers import (
+    DeleteAccountSerializer,
+    MeSerializer,
+    ProfileSerializer,
+    UserRegistrationSerializer,
+)
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from .models import User, Profile
-from rest_framework.exceptions import PermissionDenied
+from .services import UserService
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework_simplejwt.views import TokenObtainPairView
 from shared.permissions.is_owner import IsOwner
 
 
@@ -16,10 +23,45 @@ class UserRegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
 
 
-class CreateProfileView(generics.CreateAPIView):
+# Everything the app needs on startup: the user, their profile and reading
+# summary. One query here on top of the authentication one.
+class MeView(RetrieveAPIView):
+    serializer_class = MeSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        return UserService.with_reading_summary(
+            User.objects.filter(pk=self.request.user.pk)
+        ).get()
+
+
+# Token obtain hashes the password on every call, so it gets a tight per-IP rate.
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    throttle_scope = "token"
+
+
+class ProfileListCreateView(generics.ListCreateAPIView):
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated]
     queryset = Profile.objects.all()
+    max_batch_size = 100
+
+    def get_queryset(self):
+        """Batched lookup for lists of readers: ?ids=1,2,3"""
+        raw_ids = self.request.query_params.get("ids", "")
+        try:
+            ids = {int(pk) for pk in raw_ids.split(",") if pk.strip()}
+        except ValueError:
+            raise ValidationError({"ids": "Must be a comma separated list of ids"})
+
+        if not ids:
+            raise ValidationError({"ids": "This query parameter is required"})
+        if len(ids) > self.max_batch_size:
+            raise ValidationError(
+                {"ids": f"At most {self.max_batch_size} ids per request"}
+            )
+
+        return Profile.objects.filter(pk__in=ids)
 
 
 class ProfileDetailView(RetrieveAPIView):
@@ -34,6 +76,7 @@ class UpdateProfileView(generics.UpdateAPIView):
     queryset = Profile.objects.all()
 
     def get_object(self):
+        # Loaded with the user by ProfileJWTAuthentication, no extra query
         return self.request.user.profile
 
 
@@ -44,3 +87,20 @@ class DeleteProfileView(generics.DestroyAPIView):
 
     def get_object(self):
         return self.request.user.profile
+
+
+class DeleteAccountView(generics.DestroyAPIView):
+    serializer_class = DeleteAccountSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        return self.request.user
+
+    def destroy(self, request, *args, **kwargs):
+        # DELETE with {"password": ...} in the body
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return super().destroy(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        UserService.delete_account(instance)